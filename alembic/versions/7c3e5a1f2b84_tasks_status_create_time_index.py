@@ -0,0 +1,39 @@
+"""tasks status create_time index
+
+Revision ID: 7c3e5a1f2b84
+Revises: 4b1d2f6a9c10
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e5a1f2b84'
+down_revision: Union[str, None] = '4b1d2f6a9c10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в таблицу, но не может выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_status_create_time_id',
+            'tasks',
+            ['status', 'create_time', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_status_create_time_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,62 @@
+"""task_oid uuid unique
+
+Changing the column type to uuid rewrites the whole tasks table under an ACCESS EXCLUSIVE lock:
+reads and writes to tasks wait until the rewrite finishes, so run it in a maintenance window.
+The unique index is built CONCURRENTLY afterwards and does not block writes.
+
+Revision ID: 9a4f0c2d7e31
+Revises: 7c3e5a1f2b84
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f0c2d7e31'
+down_revision: Union[str, None] = '7c3e5a1f2b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'tasks',
+        'task_oid',
+        type_=postgresql.UUID(as_uuid=False),
+        existing_type=sa.String(),
+        existing_nullable=False,
+        postgresql_using='task_oid::uuid',
+    )
+    # CONCURRENTLY не блокирует запись в таблицу, но не может выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_task_oid',
+            'tasks',
+            ['task_oid'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_task_oid',
+            table_name='tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.alter_column(
+        'tasks',
+        'task_oid',
+        type_=sa.String(),
+        existing_type=postgresql.UUID(as_uuid=False),
+        existing_nullable=False,
+        postgresql_using='task_oid::text',
+    )
@@ -0,0 +1,26 @@
+"""task last status
+
+Revision ID: a6c4e2f81b37
+Revises: f3a7c1e9d205
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c4e2f81b37'
+down_revision: Union[str, None] = 'f3a7c1e9d205'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('last_status', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'last_status')
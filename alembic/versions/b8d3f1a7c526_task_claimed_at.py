@@ -0,0 +1,43 @@
+"""task claimed_at
+
+Revision ID: b8d3f1a7c526
+Revises: a6c4e2f81b37
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d3f1a7c526'
+down_revision: Union[str, None] = 'a6c4e2f81b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    # CONCURRENTLY не блокирует запись в таблицу, но не может выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_claimed_at',
+            'tasks',
+            ['claimed_at'],
+            postgresql_where=sa.text('claimed_at IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_claimed_at',
+            table_name='tasks',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('tasks', 'claimed_at')
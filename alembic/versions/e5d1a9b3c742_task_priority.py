@@ -0,0 +1,28 @@
+"""task priority
+
+Revision ID: e5d1a9b3c742
+Revises: c2e8b7d5a613
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5d1a9b3c742'
+down_revision: Union[str, None] = 'c2e8b7d5a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('priority', sa.SmallInteger(), server_default=sa.text('0'), nullable=False))
+    op.add_column('outbox', sa.Column('priority', sa.SmallInteger(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('outbox', 'priority')
+    op.drop_column('tasks', 'priority')
@@ -0,0 +1,30 @@
+"""task schedule
+
+Revision ID: f3a7c1e9d205
+Revises: e5d1a9b3c742
+Create Date: 2026-10-18 12:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a7c1e9d205'
+down_revision: Union[str, None] = 'e5d1a9b3c742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('run_at', sa.DateTime(), nullable=True))
+    op.add_column('tasks', sa.Column('interval', sa.Interval(), nullable=True))
+    op.create_index('ix_tasks_scheduled_run_at', 'tasks', ['run_at'], postgresql_where=sa.text("status = 'Scheduled'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_scheduled_run_at', table_name='tasks')
+    op.drop_column('tasks', 'interval')
+    op.drop_column('tasks', 'run_at')
@@ -0,0 +1,34 @@
+from app.infrastructure.cache.base import BaseTaskCache
+from app.infrastructure.uow.base import BaseUnitOfWork
+from app.services.admission import AdmissionController
+from app.services.events.manager import ThreadTaskQueueManager
+from app.services.init import init_dependencies
+from app.services.mediator.base import Mediator
+from app.settings.conf import Config
+
+# Зависимости объявлены async: FastAPI вызывает их прямо в event loop, а не через пул потоков,
+# как синхронный Depends(init_container)
+
+
+async def get_config() -> Config:
+    return init_dependencies().config
+
+
+async def get_mediator() -> Mediator:
+    return init_dependencies().mediator
+
+
+async def get_admission() -> AdmissionController:
+    return init_dependencies().admission
+
+
+async def get_uow() -> BaseUnitOfWork:
+    return init_dependencies().uow
+
+
+async def get_cache() -> BaseTaskCache:
+    return init_dependencies().cache
+
+
+async def get_manager() -> ThreadTaskQueueManager:
+    return init_dependencies().manager
@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 
 from app.application.lifespan import lifespan
+from app.application.metrics.handlers import router as metrics_router
+from app.application.system.handlers import router as system_router
 from app.application.tasks.handlers import router
 
 
@@ -14,4 +16,6 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(router, prefix="/tasks")
+    app.include_router(system_router, prefix="/system")
+    app.include_router(metrics_router)
     return app
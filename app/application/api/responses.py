@@ -0,0 +1,31 @@
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Dict, Mapping, Tuple, Type
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from app.common.serialization import orjson_default
+
+
+class TaskJSONResponse(ORJSONResponse):
+    """Renders plain row dicts with orjson, bypassing response_model validation and serialization.
+
+    Dates and durations come out exactly as pydantic writes them, so the body matches the schema path.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default)
+
+
+@lru_cache(maxsize=None)
+def _schema_projection(schema: Type[BaseModel]) -> Tuple[Tuple[str, ...], Callable[[Any], Tuple[Any, ...]]]:
+    fields = tuple(schema.model_fields)
+    return fields, itemgetter(*fields)
+
+
+def project(row: Mapping[str, Any], schema: Type[BaseModel]) -> Dict[str, Any]:
+    """Keeps only the schema's fields of a row, in schema order, as the schema would dump them."""
+    fields, values = _schema_projection(schema)
+    return dict(zip(fields, values(row)))
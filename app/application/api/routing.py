@@ -0,0 +1,36 @@
+import time
+from typing import Callable, Coroutine, Any
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+from app.common.metrics import HTTP_REQUEST_DURATION
+
+
+class MetricsRoute(APIRoute):
+    """Records handler latency under the route template, so /tasks/{task_oid}/ is one series, not one per oid."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            started = time.perf_counter()
+            status_code = 500
+            try:
+                response = await handler(request)
+                status_code = response.status_code
+                return response
+            except HTTPException as e:
+                status_code = e.status_code
+                raise
+            except RequestValidationError:
+                # Ошибку валидации запроса FastAPI превращает в 422 уже после выхода из обработчика
+                status_code = 422
+                raise
+            finally:
+                HTTP_REQUEST_DURATION.observe(
+                    time.perf_counter() - started, request.method, self.path_format, str(status_code),
+                )
+
+        return timed_handler
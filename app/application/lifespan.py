@@ -1,38 +1,54 @@
 from contextlib import asynccontextmanager
 
-from app.infrastructure.message_brokers.base import BaseMessageBroker
-from app.services.events.manager import ThreadTaskQueueManager
-from app.services.init import init_container
+from app.services.init import init_dependencies
 
 
 async def start_message_broker():
-    container = init_container()
-    message_broker: BaseMessageBroker = container.resolve(BaseMessageBroker)
-    await message_broker.start()
+    await init_dependencies().broker.start()
 
 
 async def stop_message_broker():
-    container = init_container()
-    message_broker: BaseMessageBroker = container.resolve(BaseMessageBroker)
-    await message_broker.close()
+    await init_dependencies().broker.close()
 
 
 async def start_manager():
-    container = init_container()
-    manager = container.resolve(ThreadTaskQueueManager)
-    await manager.start()
+    dependencies = init_dependencies()
+    if dependencies.config.api_run_worker:
+        await dependencies.manager.start()
 
 
 async def stop_manager():
-    container = init_container()
-    manager = container.resolve(ThreadTaskQueueManager)
-    await manager.stop()
+    dependencies = init_dependencies()
+    if dependencies.config.api_run_worker:
+        await dependencies.manager.stop()
+
+
+async def start_outbox_relay():
+    dependencies = init_dependencies()
+    if dependencies.config.outbox_enabled:
+        await dependencies.outbox_relay.start()
+
+
+async def stop_outbox_relay():
+    dependencies = init_dependencies()
+    if dependencies.config.outbox_enabled:
+        await dependencies.outbox_relay.stop()
+
+
+async def drain_background_handlers():
+    await init_dependencies().background.drain()
 
 
 @asynccontextmanager
 async def lifespan(*_):
+    # Граф зависимостей собирается до приёма первого запроса
+    init_dependencies()
     await start_message_broker()
     await start_manager()
+    await start_outbox_relay()
     yield
-    await stop_message_broker()
+    await drain_background_handlers()
+    # Менеджер останавливается первым: отложенные ack/nack должны уйти до закрытия канала
+    await stop_outbox_relay()
     await stop_manager()
+    await stop_message_broker()
@@ -0,0 +1,18 @@
+from fastapi import status
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRouter
+
+from app.common.metrics import REGISTRY
+
+
+router = APIRouter(tags=["System"])
+
+
+@router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    description="Prometheus metrics in text exposition format",
+    response_class=PlainTextResponse,
+)
+async def metrics_handler() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
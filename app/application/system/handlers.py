@@ -0,0 +1,61 @@
+from fastapi import Depends, status
+from fastapi.routing import APIRouter
+
+from app.application.api.dependencies import get_admission, get_cache, get_manager, get_uow
+from app.application.api.routing import MetricsRoute
+from app.application.system.schemas import AdmissionSchema, DatabasePoolSchema, TaskCacheSchema, TaskQueueSchema
+from app.infrastructure.cache.base import BaseTaskCache
+from app.infrastructure.uow.base import BaseUnitOfWork
+from app.services.admission import AdmissionController
+from app.services.events.manager import ThreadTaskQueueManager
+
+
+router = APIRouter(tags=["System"], route_class=MetricsRoute)
+
+
+@router.get(
+    "/db-pool/",
+    response_model=DatabasePoolSchema,
+    status_code=status.HTTP_200_OK,
+    description="Database connection pool usage and checkout wait times in seconds",
+)
+async def fetch_db_pool_handler(
+    uow: BaseUnitOfWork = Depends(get_uow),
+) -> DatabasePoolSchema:
+    return DatabasePoolSchema(**uow.pool_statistics())
+
+
+@router.get(
+    "/cache/",
+    response_model=TaskCacheSchema,
+    status_code=status.HTTP_200_OK,
+    description="Task detail cache size and hit/miss counters",
+)
+async def fetch_cache_handler(
+    cache: BaseTaskCache = Depends(get_cache),
+) -> TaskCacheSchema:
+    return TaskCacheSchema(**cache.statistics())
+
+
+@router.get(
+    "/queue/",
+    response_model=TaskQueueSchema,
+    status_code=status.HTTP_200_OK,
+    description="In-process ready queue depth, armed timers and queue wait times in seconds per task priority",
+)
+async def fetch_queue_handler(
+    manager: ThreadTaskQueueManager = Depends(get_manager),
+) -> TaskQueueSchema:
+    return TaskQueueSchema(**manager.queue_statistics())
+
+
+@router.get(
+    "/admission/",
+    response_model=AdmissionSchema,
+    status_code=status.HTTP_200_OK,
+    description="Task intake backlog as seen by the admission controller and rejection counters",
+)
+async def fetch_admission_handler(
+    admission: AdmissionController = Depends(get_admission),
+) -> AdmissionSchema:
+    return AdmissionSchema(**admission.statistics())
@@ -0,0 +1,42 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class LatencySchema(BaseModel):
+    count: int
+    avg: float
+    max: float
+    p50: float
+    p99: float
+
+
+class DatabasePoolSchema(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    checkout_wait: LatencySchema
+
+
+class TaskCacheSchema(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    hit_ratio: float
+
+
+class TaskQueueSchema(BaseModel):
+    depth: int
+    scheduled: int
+    wait: Dict[int, LatencySchema]
+
+
+class AdmissionSchema(BaseModel):
+    broker_depth: int
+    in_flight: int
+    clients_in_flight: int
+    high_water_mark: int
+    rejected: Dict[str, int]
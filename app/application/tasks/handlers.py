@@ -1,32 +1,45 @@
-from typing import List
+import math
+from typing import Any, AsyncIterator, Dict, List
+from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRouter
-from punq import Container
 
 from app.application.tasks.schemas import (
     CreateTaskRequestSchema,
     CreateTaskResponseSchema,
-    TaskSchema
+    CreateTasksBatchRequestSchema,
+    CreateTasksBatchResponseSchema,
+    TaskSchema,
 )
 
+from app.application.api.dependencies import get_admission, get_config, get_mediator
+from app.application.api.responses import TaskJSONResponse, project
+from app.application.api.routing import MetricsRoute
 from app.application.api.schemas import ErrorSchema
+from app.common.serialization import dumps_ndjson
 from app.domain.exceptions.base import ApplicationException
 from app.domain.sql.models import Task
-from app.infrastructure.filters.tasks import GetTasksFilters
+from app.infrastructure.filters.tasks import ExportTasksFilters, GetTasksFilters
 from app.infrastructure.repositories.base import BaseTasksRepository
 from app.infrastructure.uow.base import BaseUnitOfWork
-from app.services.commands.tasks import CreateTaskCommand
+from app.services.admission import AdmissionController
+from app.services.commands.tasks import CreateTaskCommand, CreateTasksBatchCommand
+from app.services.exceptions.admission import TaskAdmissionRejectedException
+from app.services.exceptions.mediator import MediatorTimeoutException
 from app.services.exceptions.tasks import TaskNotFoundException
-from app.services.init import init_container
 from app.services.mediator.base import Mediator
-from app.services.queries.tasks import GetTasksQuery, GetTaskDetailQuery
+from app.services.queries.tasks import ExportTasksQuery, GetTasksQuery, GetTaskDetailQuery
+from app.settings.conf import Config
 
 # from app.services.init import init_container
 # from app.services.mediator.base import Mediator
 
 
-router = APIRouter(tags=["Tasks Scheduler"])
+router = APIRouter(tags=["Tasks Scheduler"], route_class=MetricsRoute)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 @router.post(
@@ -37,17 +50,31 @@ router = APIRouter(tags=["Tasks Scheduler"])
     responses={
         status.HTTP_201_CREATED: {"model": CreateTaskRequestSchema},
         status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": ErrorSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorSchema},
     },
 )
 async def create_task_handler(
+    request: Request,
     schema: CreateTaskRequestSchema,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
+    admission: AdmissionController = Depends(get_admission),
 ) -> CreateTaskResponseSchema:
     """Creating new task instance."""
-    mediator: Mediator = container.resolve(Mediator)
     try:
-
-        task, *_ = await mediator.handle_command(CreateTaskCommand(description=schema.description))
+        async with admission.admit(schema.priority, _client_id(request)):
+            task, *_ = await mediator.handle_command(
+                CreateTaskCommand(
+                    description=schema.description,
+                    priority=schema.priority,
+                    run_at=schema.run_at,
+                    interval=schema.interval,
+                )
+            )
+    except TaskAdmissionRejectedException as e:
+        raise _too_many_requests(e)
+    except MediatorTimeoutException as e:
+        raise _service_unavailable(e)
     except ApplicationException as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -56,6 +83,69 @@ async def create_task_handler(
     return CreateTaskResponseSchema.from_entity(task)
 
 
+@router.post(
+    "/batch/",
+    response_model=CreateTasksBatchResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+    description="Creating many tasks with one insert and one broker batch",
+    responses={
+        status.HTTP_201_CREATED: {"model": CreateTasksBatchResponseSchema},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": ErrorSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorSchema},
+    },
+)
+async def create_tasks_batch_handler(
+    request: Request,
+    schema: CreateTasksBatchRequestSchema,
+    mediator: Mediator = Depends(get_mediator),
+    admission: AdmissionController = Depends(get_admission),
+) -> CreateTasksBatchResponseSchema:
+    """Creating a batch of task instances."""
+    try:
+        async with admission.admit(schema.priority, _client_id(request), count=len(schema.descriptions)):
+            tasks, *_ = await mediator.handle_command(
+                CreateTasksBatchCommand(
+                    descriptions=schema.descriptions,
+                    priority=schema.priority,
+                    run_at=schema.run_at,
+                    interval=schema.interval,
+                )
+            )
+    except TaskAdmissionRejectedException as e:
+        raise _too_many_requests(e)
+    except MediatorTimeoutException as e:
+        raise _service_unavailable(e)
+    except ApplicationException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": e.message},
+        )
+    return CreateTasksBatchResponseSchema.from_entities(tasks)
+
+
+@router.get(
+    "/export/",
+    status_code=status.HTTP_200_OK,
+    description="Streaming export of tasks as newline-delimited JSON, oldest first",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"application/x-ndjson": {}}},
+    },
+)
+async def export_tasks_handler(
+    filters: ExportTasksFilters = Depends(),
+    mediator: Mediator = Depends(get_mediator),
+) -> StreamingResponse:
+    chunks: AsyncIterator[List[Dict[str, Any]]] = await mediator.handle_query(ExportTasksQuery(filters=filters))
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        async for rows in chunks:
+            yield dumps_ndjson(rows)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @router.get(
     "/{task_oid}/",
     status_code=status.HTTP_200_OK,
@@ -63,15 +153,18 @@ async def create_task_handler(
     responses={
         status.HTTP_200_OK: {"model": TaskSchema},
         status.HTTP_404_NOT_FOUND: {"model": ErrorSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorSchema},
     },
 )
 async def fetch_task_handler(
-    task_oid: str,
-    container: Container = Depends(init_container),
+    task_oid: UUID,
+    mediator: Mediator = Depends(get_mediator),
+    config: Config = Depends(get_config),
 ) -> TaskSchema:
-    mediator = container.resolve(Mediator)
     try:
-        current_task = await mediator.handle_query(GetTaskDetailQuery(task_oid=task_oid))
+        current_task = await mediator.handle_query(GetTaskDetailQuery(task_oid=str(task_oid)))
+        if config.api_fast_json:
+            return TaskJSONResponse(project(current_task, TaskSchema))
         return TaskSchema(**current_task)
     except TaskNotFoundException as e:
 
@@ -79,25 +172,65 @@ async def fetch_task_handler(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"error": e.message},
         )
+    except MediatorTimeoutException as e:
+        raise _service_unavailable(e)
 
 
 @router.get(
     "/",
     status_code=status.HTTP_200_OK,
-    description="getting all tasks",
+    description=(
+        "getting all tasks, newest first; when there are more, the X-Next-Cursor response header "
+        "holds the cursor of the next page"
+    ),
     responses={
         status.HTTP_200_OK: {"model": List[TaskSchema]},
-        status.HTTP_404_NOT_FOUND: {"model": ErrorSchema},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorSchema},
     },
 )
 async def fetch_tasks_handler(
+    response: Response,
     filters: GetTasksFilters = Depends(),
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
+    config: Config = Depends(get_config),
 ) -> List[TaskSchema]:
-    mediator: Mediator = container.resolve(Mediator)
+    try:
+        page = await mediator.handle_query(
+            GetTasksQuery(filters=filters)
+        )
+    except MediatorTimeoutException as e:
+        raise _service_unavailable(e)
+    except ApplicationException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": e.message},
+        )
+    # Тело остаётся списком, как и до курсорной пагинации: курсор передаётся заголовком, чтобы не ломать клиентов
+    headers = {NEXT_CURSOR_HEADER: page["next_cursor"]} if page["next_cursor"] else {}
+    if config.api_fast_json:
+        # Строки из базы уже соответствуют TaskSchema: повторная валидация pydantic только тратит CPU
+        return TaskJSONResponse([project(task, TaskSchema) for task in page["items"]], headers=headers)
+    response.headers.update(headers)
+    return [TaskSchema(**task) for task in page["items"]]
+
+
+def _client_id(request: Request) -> str:
+    return request.headers.get("X-Client-Id") or (request.client.host if request.client else "unknown")
+
+
+def _too_many_requests(e: TaskAdmissionRejectedException) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={"error": e.message},
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
 
-    tasks = await mediator.handle_query(
-        GetTasksQuery(filters=filters)
+def _service_unavailable(e: MediatorTimeoutException) -> HTTPException:
+    # Таймаут медиатора - перегрузка на стороне сервера, а не ошибка клиента
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={"error": e.message},
+        headers={"Retry-After": str(max(1, math.ceil(e.timeout)))},
     )
-    tasks = [TaskSchema(**task) for task in tasks]
-    return tasks
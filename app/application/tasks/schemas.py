@@ -1,13 +1,27 @@
 from datetime import timedelta, datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
-from app.domain.entities.tasks import Task
+from app.domain.entities.tasks import MAX_TASK_PRIORITY, Task
 
 
-class CreateTaskRequestSchema(BaseModel):
+class ScheduleRequestMixin(BaseModel):
+    run_at: Optional[datetime] = Field(default=None, description="First run time; now if only interval is set")
+    interval: Optional[timedelta] = Field(default=None, gt=timedelta(0), description="Repeat period")
+
+    @field_validator("run_at")
+    @classmethod
+    def to_local_naive(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Время в базе хранится без зоны, в локальном времени сервера
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
+
+
+class CreateTaskRequestSchema(ScheduleRequestMixin):
     description: str
+    priority: int = Field(default=0, ge=0, le=MAX_TASK_PRIORITY)
 
 
 class CreateTaskResponseSchema(BaseModel):
@@ -19,13 +33,30 @@ class CreateTaskResponseSchema(BaseModel):
         return cls(oid=task.oid, description=task.description)
 
 
+class CreateTasksBatchRequestSchema(ScheduleRequestMixin):
+    descriptions: List[str] = Field(min_length=1, max_length=1000)
+    priority: int = Field(default=0, ge=0, le=MAX_TASK_PRIORITY)
+
+
+class CreateTasksBatchResponseSchema(BaseModel):
+    oids: List[str]
+
+    @classmethod
+    def from_entities(cls, tasks: List[Task]) -> "CreateTasksBatchResponseSchema":
+        return cls(oids=[task.oid for task in tasks])
+
+
 class TaskSchema(BaseModel):
     task_oid: str
     description: str
     status: str
+    priority: int = Field(default=0)
     create_time: datetime
     start_time: Optional[datetime] = Field(default=None)
     exec_time: Optional[timedelta] = Field(default=None)
+    run_at: Optional[datetime] = Field(default=None)
+    interval: Optional[timedelta] = Field(default=None)
+    last_status: Optional[str] = Field(default=None, description="Outcome of the latest run of a recurring task")
 
     class Config:
         from_attributes = True
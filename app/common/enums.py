@@ -3,6 +3,29 @@ from enum import Enum
 
 class Status(Enum):
     in_queue = "In Queue"
+    scheduled = "Scheduled"
     run = "Run"
     completed = "Completed"
     failed = "Failed"
+
+
+class SchedulerMode(Enum):
+    thread = "thread"
+    asyncio = "asyncio"
+
+
+class ExecutorBackend(Enum):
+    thread = "thread"
+    process = "process"
+    inline = "inline"
+
+
+class DispatchPolicy(Enum):
+    sequential = "sequential"
+    concurrent = "concurrent"
+    background = "background"
+
+
+class BrokerBackend(Enum):
+    rabbitmq = "rabbitmq"
+    memory = "memory"
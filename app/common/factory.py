@@ -1,7 +1,47 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+import time
 
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
-def session_factory(engine_url):
-    engine = create_async_engine(engine_url)
-    session = async_sessionmaker(bind=engine)
-    return session()
+from app.common.metrics import DB_QUERY_DURATION
+
+
+def engine_factory(
+    engine_url: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30,
+    pool_pre_ping: bool = True,
+    pool_recycle: int = -1,
+) -> AsyncEngine:
+    engine = create_async_engine(
+        engine_url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+    )
+    _instrument_engine(engine)
+    return engine
+
+
+def _instrument_engine(engine: AsyncEngine) -> None:
+    """Times every statement by its leading keyword (SELECT, INSERT, UPDATE...)."""
+    # Время старта хранится в контексте выполнения, а не в стеке соединения: упавший запрос
+    # не доходит до after_cursor_execute и иначе оставлял бы в стеке запись, сбивающую следующие замеры
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is not None:
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, statement.split(None, 1)[0].upper())
+
+
+def session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    # Объекты остаются доступными после commit: сессия закрывается сразу после транзакции
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
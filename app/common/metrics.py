@@ -0,0 +1,164 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Границы в секундах: от сотни микросекунд (кэш, запросы по индексу) до десятков секунд (выполнение задач)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+TASK_EXEC_BUCKETS: Tuple[float, ...] = (0.1, 0.5, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 15.0, 30.0, 60.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+@dataclass(eq=False)
+class Counter:
+    name: str
+    documentation: str
+    labelnames: Labels = ()
+    _values: Dict[Labels, float] = field(default_factory=dict, init=False, repr=False)
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+@dataclass(eq=False)
+class Gauge:
+    """Gauge whose value is either set directly or read from a callback at scrape time."""
+    name: str
+    documentation: str
+    labelnames: Labels = ()
+    _values: Dict[Labels, float] = field(default_factory=dict, init=False, repr=False)
+    _function: Optional[Callable[[], Dict[Labels, float]]] = field(default=None, init=False, repr=False)
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def set_function(self, function: Callable[[], Dict[Labels, float]]) -> None:
+        self._function = function
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        values = self._function() if self._function else self._values
+        for labels, value in values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+@dataclass(eq=False)
+class _HistogramSeries:
+    buckets: List[int]
+    count: int = 0
+    total: float = 0.0
+
+
+@dataclass(eq=False)
+class Histogram:
+    """Fixed-bucket histogram: observe is one bisect and three increments, cumulative sums are built on scrape."""
+    name: str
+    documentation: str
+    labelnames: Labels = ()
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    _series: Dict[Labels, _HistogramSeries] = field(default_factory=dict, init=False, repr=False)
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(buckets=[0] * (len(self.buckets) + 1))
+        series.buckets[bisect_left(self.buckets, value)] += 1
+        series.count += 1
+        series.total += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bounds = [*self.buckets, float("inf")]
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, hits in zip(bounds, series.buckets):
+                cumulative += hits
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            plain_labels = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{plain_labels} {_format_value(series.total)}")
+            lines.append(f"{self.name}_count{plain_labels} {series.count}")
+        return lines
+
+
+@dataclass(eq=False)
+class MetricsRegistry:
+    _metrics: Dict[str, Counter | Gauge | Histogram] = field(default_factory=dict, init=False)
+
+    def register(self, metric: Counter | Gauge | Histogram) -> Counter | Gauge | Histogram:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"),
+))
+MEDIATOR_DURATION = REGISTRY.register(Histogram(
+    "mediator_duration_seconds", "Mediator command, query and event handling time", ("operation", "type"),
+))
+DB_QUERY_DURATION = REGISTRY.register(Histogram(
+    "db_query_duration_seconds", "Database statement execution time by statement kind", ("statement",),
+))
+BROKER_PUBLISHED = REGISTRY.register(Counter(
+    "broker_messages_published_total", "Messages published to the broker", ("routing_key",),
+))
+BROKER_CONSUMED = REGISTRY.register(Counter(
+    "broker_messages_consumed_total", "Messages delivered by the broker", ("routing_key",),
+))
+BROKER_PUBLISH_DURATION = REGISTRY.register(Histogram(
+    "broker_publish_duration_seconds", "Time to publish one batch including publisher confirms", ("routing_key",),
+))
+TASK_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "task_queue_depth", "Tasks waiting in the in-process queue, and armed timers", ("queue",),
+))
+EXECUTOR_WORKERS = REGISTRY.register(Gauge(
+    "executor_workers", "Task executor workers by state", ("state",),
+))
+TASK_EXEC_TIME = REGISTRY.register(Histogram(
+    "task_exec_time_seconds", "Task execution time by final status", ("status",), buckets=TASK_EXEC_BUCKETS,
+))
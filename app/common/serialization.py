@@ -0,0 +1,42 @@
+from datetime import timedelta
+from typing import Any, Iterable, Mapping
+
+import orjson
+
+
+def orjson_default(obj: Any) -> Any:
+    """Fallback for types orjson does not serialize natively, formatted the way pydantic does."""
+    if isinstance(obj, timedelta):
+        return duration_isoformat(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def duration_isoformat(value: timedelta) -> str:
+    sign = ""
+    if value < timedelta(0):
+        sign, value = "-", -value
+    years, days = divmod(value.days, 365)
+    hours, seconds = divmod(value.seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    microseconds = value.microseconds
+
+    result = sign + "P"
+    if years:
+        result += f"{years}Y"
+    if days:
+        result += f"{days}D"
+    if hours or minutes or seconds or microseconds or not (years or days):
+        result += "T"
+        if hours:
+            result += f"{hours}H"
+        if minutes:
+            result += f"{minutes}M"
+        if microseconds:
+            result += f"{seconds}.{microseconds:06d}".rstrip("0") + "S"
+        elif seconds or not (hours or minutes):
+            result += f"{seconds}S"
+    return result
+
+
+def dumps_ndjson(rows: Iterable[Mapping[str, Any]]) -> bytes:
+    return b"".join(orjson.dumps(row, default=orjson_default, option=orjson.OPT_APPEND_NEWLINE) for row in rows)
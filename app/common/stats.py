@@ -0,0 +1,37 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict
+
+
+@dataclass(eq=False)
+class LatencyWindow:
+    """Running latency counters plus a sliding window of recent samples for percentiles."""
+    size: int = 1024
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    _samples: Deque[float] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._samples = deque(maxlen=self.size)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self._samples.append(value)
+
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return 0.0
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+        }
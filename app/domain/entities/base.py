@@ -1,25 +1,32 @@
 from abc import ABC
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import uuid4
 
 from app.domain.events.base import BaseEvent
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class BaseEntity(ABC):
+    """Slotted, so a backlog of entities costs fixed-size objects without a __dict__ each.
+
+    The event list is allocated on the first register_event(): entities rebuilt from messages or rows
+    never register any, and pull_events() drops the list again.
+    """
     oid: str = field(default_factory=lambda: str(uuid4()), kw_only=True)
-    created_at: datetime = field(default_factory=lambda: datetime.now(), kw_only=True)
+    created_at: datetime = field(default_factory=datetime.now, kw_only=True)
     description: str = field(default=None)
-    _events: List[BaseEvent] = field(default_factory=list, kw_only=True)
+    _events: Optional[List[BaseEvent]] = field(default=None, kw_only=True, repr=False)
 
     def pull_events(self) -> List[BaseEvent]:
-        registered_events = self._events.copy()
-        self._events.clear()
+        registered_events = self._events or []
+        self._events = None
         return registered_events
 
     def register_event(self, event: BaseEvent) -> None:
+        if self._events is None:
+            self._events = []
         self._events.append(event)
 
     def __hash__(self) -> int:
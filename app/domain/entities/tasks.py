@@ -1,19 +1,45 @@
+import asyncio
 import time
 import random
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
 
 from app.common.enums import Status
 from app.domain.entities.base import BaseEntity
 from app.domain.events.tasks import NewTaskCreatedEvent
 
+MAX_TASK_PRIORITY = 9
 
-@dataclass(eq=False)
+
+@dataclass(eq=False, slots=True)
 class Task(BaseEntity):
     start_time: datetime = field(default=None)
     exec_time: timedelta = field(default=None)
     status: str = field(default=None)
+    priority: int = field(default=0)
+    run_at: Optional[datetime] = field(default=None)
+    interval: Optional[timedelta] = field(default=None)
+    last_status: Optional[str] = field(default=None)
+
+    @property
+    def is_scheduled(self) -> bool:
+        return self.run_at is not None
+
+    def reschedule(self, now: datetime) -> bool:
+        """Moves run_at of a recurring task to its first slot after now; one-shot tasks are left as is.
+
+        The outcome of the run that just finished is kept in last_status, since status goes back to Scheduled.
+        """
+        if not self.interval:
+            return False
+        self.last_status = self.status
+        # Пропущенные за время простоя запуски не догоняем: следующий срок всегда в будущем
+        missed = (now - self.run_at) // self.interval + 1 if self.run_at <= now else 1
+        self.run_at += self.interval * missed
+        self.status = Status.scheduled.value
+        return True
 
     def run_task(self) -> "Task":
         self.status = Status.run.value
@@ -25,8 +51,80 @@ class Task(BaseEntity):
         self.status = random.choice([Status.completed.value, Status.failed.value])
         return self
 
+    async def run_task_async(self) -> "Task":
+        self.status = Status.run.value
+        start_time = datetime.now()
+        self.start_time = start_time
+        await asyncio.sleep(random.randint(0, 10))
+        exec_time = datetime.now() - start_time
+        self.exec_time = exec_time
+        self.status = random.choice([Status.completed.value, Status.failed.value])
+        return self
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            "oid": self.oid,
+            "description": self.description,
+            "status": self.status,
+            "priority": self.priority,
+            "run_at": self.run_at.isoformat() if self.run_at else None,
+            "interval": self.interval.total_seconds() if self.interval else None,
+        }
+
+    def apply_result(self, result: Dict[str, Any]) -> "Task":
+        self.status = result["status"]
+        self.start_time = result["start_time"]
+        self.exec_time = result["exec_time"]
+        return self
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Task":
+        return cls(
+            oid=payload["oid"],
+            description=payload["description"],
+            status=payload["status"],
+            priority=payload.get("priority", 0),
+            run_at=datetime.fromisoformat(payload["run_at"]) if payload.get("run_at") else None,
+            interval=timedelta(seconds=payload["interval"]) if payload.get("interval") else None,
+        )
+
     @classmethod
-    def create_task(cls, status: str, description: str) -> "Task":
-        new_task = cls(status=status, description=description)
-        new_task.register_event(NewTaskCreatedEvent(task=new_task))
+    def create_task(
+        cls,
+        status: str,
+        description: str,
+        priority: int = 0,
+        run_at: Optional[datetime] = None,
+        interval: Optional[timedelta] = None,
+    ) -> "Task":
+        if run_at or interval:
+            # Периодическая задача без run_at стартует сразу
+            run_at = run_at or datetime.now()
+            status = Status.scheduled.value
+        new_task = cls(status=status, description=description, priority=priority, run_at=run_at, interval=interval)
+        # Событие и задача созданы в один момент: общий datetime вместо второго datetime.now()
+        new_task.register_event(NewTaskCreatedEvent(task=new_task, created_at=new_task.created_at))
         return new_task
+
+    @classmethod
+    def create_tasks(
+        cls,
+        status: str,
+        descriptions: Iterable[str],
+        priority: int = 0,
+        run_at: Optional[datetime] = None,
+        interval: Optional[timedelta] = None,
+    ) -> List["Task"]:
+        if run_at or interval:
+            run_at = run_at or datetime.now()
+            status = Status.scheduled.value
+        return [
+            cls(status=status, description=description, priority=priority, run_at=run_at, interval=interval)
+            for description in descriptions
+        ]
+
+
+def run_task_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Entry point for process pool workers: runs the task and returns only the fields to persist."""
+    task = Task.from_payload(payload).run_task()
+    return {"status": task.status, "start_time": task.start_time, "exec_time": task.exec_time}
@@ -5,7 +5,7 @@ from typing import ClassVar
 from uuid import UUID, uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseEvent(ABC):
     title: ClassVar[str]
     event_id: UUID = field(default_factory=uuid4, kw_only=True)
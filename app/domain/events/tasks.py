@@ -1,16 +1,22 @@
 from dataclasses import dataclass, field
-from typing import ClassVar
+from typing import ClassVar, List
 
 from app.domain.events.base import BaseEvent
 
 
-@dataclass
+@dataclass(slots=True)
 class NewTaskReceivedEvent(BaseEvent):
     task_oid: str
     title: ClassVar[str] = "New Task Received"
 
 
-@dataclass
+@dataclass(slots=True)
 class NewTaskCreatedEvent(BaseEvent):
     task: None = field(default=None)
     title: ClassVar[str] = "New Task Created"
+
+
+@dataclass(slots=True)
+class NewTasksBatchCreatedEvent(BaseEvent):
+    tasks: List = field(default_factory=list)
+    title: ClassVar[str] = "New Tasks Batch Created"
@@ -1,4 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, Interval
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Tuple
+
+from sqlalchemy import BigInteger, Column, Index, Integer, SmallInteger, String, DateTime, Interval, Uuid, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, class_mapper
 
 
@@ -6,16 +11,55 @@ class Base(DeclarativeBase):
     ...
 
 
+@lru_cache(maxsize=None)
+def _column_projection(model_class: type) -> Tuple[Tuple[str, ...], Callable[[Any], Tuple[Any, ...]], Callable[[Any], Tuple[Any, ...]]]:
+    """Column keys of a mapped class, and getters reading all of them into a tuple in one call.
+
+    The first getter reads loaded values straight from the instance __dict__, the second goes through
+    the instrumented attributes and so also loads expired or deferred columns.
+    """
+    keys = tuple(column.key for column in class_mapper(model_class).columns)
+    return keys, itemgetter(*keys), attrgetter(*keys)
+
+
 class Task(Base):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        Index('ix_tasks_status_create_time_id', 'status', 'create_time', 'id'),
+        Index('ix_tasks_scheduled_run_at', 'run_at', postgresql_where=text("status = 'Scheduled'")),
+        Index('ix_tasks_claimed_at', 'claimed_at', postgresql_where=text('claimed_at IS NOT NULL')),
+    )
     id = Column(Integer, primary_key=True, nullable=False)
-    task_oid = Column(String, nullable=False)
+    task_oid = Column(Uuid(as_uuid=False), nullable=False, unique=True, index=True)
     description = Column(String, nullable=False)
     status = Column(String, nullable=False)
+    priority = Column(SmallInteger, nullable=False, default=0, server_default=text('0'))
     create_time = Column(DateTime, nullable=False)
     start_time = Column(DateTime)
     exec_time = Column(Interval)
+    run_at = Column(DateTime)
+    interval = Column(Interval)
+    last_status = Column(String)
+    # Когда строку по сроку забрал воркер; сбрасывается записью статуса после выполнения
+    claimed_at = Column(DateTime)
+
+    def to_dict(self) -> Dict[str, Any]:
+        keys, loaded, attributes = _column_projection(self.__class__)
+        try:
+            values = loaded(self.__dict__)
+        except KeyError:
+            values = attributes(self)
+        return dict(zip(keys, values))
+
 
-    def to_dict(self):
-        return {c.key: getattr(self, c.key)
-                for c in class_mapper(self.__class__).columns}
+class OutboxMessage(Base):
+    __tablename__ = 'outbox'
+    __table_args__ = (
+        Index('ix_outbox_pending', 'id', postgresql_where=text('sent_at IS NULL')),
+    )
+    id = Column(BigInteger, primary_key=True, nullable=False)
+    routing_key = Column(String, nullable=False)
+    priority = Column(SmallInteger, nullable=False, default=0, server_default=text('0'))
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    sent_at = Column(DateTime)
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+
+@dataclass
+class BaseTaskCache(ABC):
+    @abstractmethod
+    def get(self, task_oid: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def set(self, task_oid: str, task: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate(self, task_oids: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def statistics(self) -> Dict[str, Any]:
+        ...
@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from app.common.enums import Status
+from app.infrastructure.cache.base import BaseTaskCache
+
+TERMINAL_STATUSES: FrozenSet[str] = frozenset({Status.completed.value, Status.failed.value})
+
+
+@dataclass
+class LRUTaskCache(BaseTaskCache):
+    """Bounded LRU cache of task detail dicts.
+
+    Tasks in a terminal status never change again and stay until evicted; all others expire
+    after ``ttl`` seconds. invalidate() only reaches this process, so the cache is only correct
+    where the statuses are written; ``max_size=0`` disables it (nothing is stored, every get misses).
+    """
+    max_size: int = 10_000
+    ttl: float = 2.0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    _entries: "OrderedDict[str, Tuple[Dict[str, Any], Optional[float]]]" = field(
+        default_factory=OrderedDict, init=False, repr=False,
+    )
+
+    def get(self, task_oid: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(task_oid)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        task, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[task_oid]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(task_oid)
+        self.hits += 1
+        return task
+
+    def set(self, task_oid: str, task: Dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = None if task.get("status") in TERMINAL_STATUSES else time.monotonic() + self.ttl
+        self._entries[task_oid] = (task, expires_at)
+        self._entries.move_to_end(task_oid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, task_oids: Iterable[str]) -> None:
+        for task_oid in task_oids:
+            if self._entries.pop(task_oid, None) is not None:
+                self.invalidations += 1
+
+    def statistics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
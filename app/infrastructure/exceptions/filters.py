@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from app.infrastructure.exceptions.base import InfrastructureException
+
+
+@dataclass(eq=False)
+class InvalidCursorException(InfrastructureException):
+    cursor: str
+
+    @property
+    def message(self):
+        return f"Invalid pagination cursor - {self.cursor}"
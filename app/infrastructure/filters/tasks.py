@@ -1,9 +1,46 @@
+import base64
+import binascii
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Optional
+
+import orjson
+from fastapi import Query
 
 from app.common.enums import Status
+from app.infrastructure.exceptions.filters import InvalidCursorException
+
+
+MAX_TASKS_PAGE_SIZE = 1000
 
 
 @dataclass
 class GetTasksFilters:
-    limit: int = 5
+    # Ограничение проверяет FastAPI при разборе query-параметров, до запроса в базу
+    limit: Annotated[int, Query(ge=1, le=MAX_TASKS_PAGE_SIZE)] = 5
     status: str = Status.completed.value
+    cursor: Optional[str] = None
+
+
+@dataclass
+class ExportTasksFilters:
+    status: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class TasksCursor:
+    """Keyset position in the (create_time, id) ordering of the tasks list."""
+    create_time: datetime
+    id: int
+
+    def encode(self) -> str:
+        payload = orjson.dumps([self.create_time.isoformat(), self.id])
+        return base64.urlsafe_b64encode(payload).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "TasksCursor":
+        try:
+            create_time, id_ = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return cls(create_time=datetime.fromisoformat(create_time), id=int(id_))
+        except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+            raise InvalidCursorException(cursor)
@@ -1,6 +1,21 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, AsyncIterator, Dict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+
+
+@dataclass
+class ConsumedMessage:
+    """Delivered message which stays unacknowledged until the consumer calls ack() or nack()."""
+    routing_key: str
+    data: Any
+    _ack: Callable[[], Awaitable[None]] = field(repr=False)
+    _nack: Callable[[bool], Awaitable[None]] = field(repr=False)
+
+    async def ack(self) -> None:
+        await self._ack()
+
+    async def nack(self, requeue: bool = True) -> None:
+        await self._nack(requeue)
 
 
 @dataclass
@@ -14,16 +29,24 @@ class BaseMessageBroker(ABC):
         ...
 
     @abstractmethod
-    async def send_message(self, routing_key: str, data: Any) -> None:
+    async def send_message(self, routing_key: str, data: Any, priority: int = 0) -> None:
         ...
 
+    async def send_messages(self, routing_key: str, data: Iterable[Any], priority: int = 0) -> None:
+        for item in data:
+            await self.send_message(routing_key, item, priority=priority)
+
     @abstractmethod
-    async def start_consuming(self) -> AsyncIterator[Dict]:
+    async def start_consuming(self) -> AsyncIterator[ConsumedMessage]:
         ...
 
     @abstractmethod
     async def stop_consuming(self) -> None:
         ...
 
+    async def queue_depth(self) -> int:
+        """Messages waiting in the task queue; brokers that cannot tell report 0."""
+        return 0
+
     async def consume(self):
         ...
@@ -0,0 +1,189 @@
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, Tuple
+
+import orjson
+
+from app.common.metrics import BROKER_CONSUMED, BROKER_PUBLISHED
+
+from .base import BaseMessageBroker, ConsumedMessage
+from ..exceptions.message_broker import ConnectionNotInitializedException
+
+
+@lru_cache(maxsize=4096)
+def topic_matches(binding_key: str, routing_key: str) -> bool:
+    """AMQP topic matching: '*' stands for exactly one word, '#' for zero or more words."""
+    return _match_words(tuple(binding_key.split(".")), tuple(routing_key.split(".")))
+
+
+def _match_words(pattern: Tuple[str, ...], words: Tuple[str, ...]) -> bool:
+    if not pattern:
+        return not words
+    head, rest = pattern[0], pattern[1:]
+    if head == "#":
+        return any(_match_words(rest, words[skip:]) for skip in range(len(words) + 1))
+    if not words:
+        return False
+    return (head == "*" or head == words[0]) and _match_words(rest, words[1:])
+
+
+@dataclass(eq=False)
+class _Envelope:
+    routing_key: str
+    body: bytes
+    priority: int
+    redelivered: bool = False
+
+
+@dataclass
+class InMemoryMessageBroker(BaseMessageBroker):
+    """Process-local broker with RabbitMQ-like semantics for one topic-bound queue.
+
+    Publishing blocks while queue_size messages are in the broker, ready or unacknowledged. Each consumer
+    holds at most prefetch_count unacknowledged messages; nack(requeue=True) puts a message back at its
+    priority, nack(requeue=False) drops it, and messages still unacknowledged on close() are requeued.
+    stop_consuming() ends every consumer loop, including ones waiting for a message or a prefetch credit.
+    Bodies are orjson-encoded like on the wire, so consumers see exactly what RabbitMQ would deliver.
+    """
+    binding_keys: Tuple[str, ...] = ("#",)
+    queue_size: int = 10_000
+    prefetch_count: int = 32
+    max_priority: int = 9
+    queue: Optional[asyncio.PriorityQueue] = None
+    is_initialized: bool = False
+    _capacity: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+    _sequence: itertools.count = field(default_factory=itertools.count, repr=False)
+    _unacked: Dict[int, _Envelope] = field(default_factory=dict, repr=False)
+    _delivery_tags: itertools.count = field(default_factory=lambda: itertools.count(1), repr=False)
+    _closing: Optional[asyncio.Event] = field(default=None, repr=False)
+    _counters: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(("published", "unroutable", "delivered", "acked", "nacked", "redelivered"), 0),
+        repr=False,
+    )
+
+    @classmethod
+    def create(cls, **options: Any) -> 'InMemoryMessageBroker':
+        return cls(**options)
+
+    async def start(self) -> None:
+        if not self.is_initialized:
+            # После close() очередь сохраняется вместе с возвращёнными в неё сообщениями
+            if self.queue is None:
+                self.queue = asyncio.PriorityQueue()
+                self._capacity = asyncio.Semaphore(self.queue_size)
+            self._closing = asyncio.Event()
+            self.is_initialized = True
+
+    async def close(self) -> None:
+        if not self.is_initialized:
+            return
+        self._closing.set()
+        # Как при закрытии канала RabbitMQ: неподтверждённые сообщения возвращаются в очередь
+        for envelope in list(self._unacked.values()):
+            self._requeue(envelope)
+        self._unacked.clear()
+        self.is_initialized = False
+
+    async def send_message(self, routing_key: str, data: Any, priority: int = 0) -> None:
+        if not self.is_initialized:
+            await self.start()
+        self._counters["published"] += 1
+        BROKER_PUBLISHED.inc(routing_key)
+        if not any(topic_matches(binding_key, routing_key) for binding_key in self.binding_keys):
+            self._counters["unroutable"] += 1
+            return
+        priority = min(max(priority, 0), self.max_priority)
+        await self._put(_Envelope(routing_key=routing_key, body=orjson.dumps(data), priority=priority))
+
+    async def start_consuming(self) -> AsyncIterator[ConsumedMessage]:
+        if not self.is_initialized:
+            await self.start()
+        if self.queue is None:
+            raise ConnectionNotInitializedException("Broker not initialized")
+
+        credits = asyncio.Semaphore(self.prefetch_count)
+        while True:
+            # Быстрый путь без ожидания: кредит свободен и сообщение уже в очереди
+            if not credits.locked():
+                await credits.acquire()
+            elif await self._unless_closing(credits.acquire()) is None:
+                return
+            if not self.queue.empty():
+                entry = self.queue.get_nowait()
+            else:
+                got = await self._unless_closing(self.queue.get())
+                if got is None:
+                    credits.release()
+                    return
+                entry = got.result()
+            if self._closing.is_set():
+                # stop_consuming() пришёл вместе с сообщением: не выдаём его, а возвращаем на прежнее место
+                self.queue.put_nowait(entry)
+                credits.release()
+                return
+            _, _, envelope = entry
+            delivery_tag = next(self._delivery_tags)
+            self._unacked[delivery_tag] = envelope
+            self._counters["delivered"] += 1
+            BROKER_CONSUMED.inc(envelope.routing_key)
+            yield ConsumedMessage(
+                routing_key=envelope.routing_key,
+                data=orjson.loads(envelope.body),
+                _ack=self._ack_callback(delivery_tag, credits),
+                _nack=self._nack_callback(delivery_tag, credits),
+            )
+
+    async def _unless_closing(self, awaitable: Awaitable[Any]) -> Optional[asyncio.Future]:
+        """Awaits together with stop_consuming(); returns the finished future, or None if closing came first."""
+        waiter = asyncio.ensure_future(awaitable)
+        closing = asyncio.ensure_future(self._closing.wait())
+        try:
+            await asyncio.wait((waiter, closing), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            closing.cancel()
+            if not waiter.done():
+                waiter.cancel()
+        return waiter if waiter.done() and not waiter.cancelled() else None
+
+    async def stop_consuming(self) -> None:
+        if self._closing:
+            self._closing.set()
+
+    async def queue_depth(self) -> int:
+        return self.queue.qsize() if self.queue else 0
+
+    def statistics(self) -> Dict[str, int]:
+        return {**self._counters, "depth": self.queue.qsize() if self.queue else 0, "unacked": len(self._unacked)}
+
+    def _ack_callback(self, delivery_tag: int, credits: asyncio.Semaphore):
+        async def ack() -> None:
+            if self._unacked.pop(delivery_tag, None) is not None:
+                self._counters["acked"] += 1
+                credits.release()
+                self._capacity.release()
+        return ack
+
+    def _nack_callback(self, delivery_tag: int, credits: asyncio.Semaphore):
+        async def nack(requeue: bool) -> None:
+            envelope = self._unacked.pop(delivery_tag, None)
+            if envelope is None:
+                return
+            self._counters["nacked"] += 1
+            credits.release()
+            if requeue:
+                self._requeue(envelope)
+            else:
+                self._capacity.release()
+        return nack
+
+    async def _put(self, envelope: _Envelope) -> None:
+        await self._capacity.acquire()
+        self.queue.put_nowait((-envelope.priority, next(self._sequence), envelope))
+
+    def _requeue(self, envelope: _Envelope) -> None:
+        # Место в лимите за сообщением уже числится, поэтому возврат не ждёт
+        envelope.redelivered = True
+        self._counters["redelivered"] += 1
+        self.queue.put_nowait((-envelope.priority, next(self._sequence), envelope))
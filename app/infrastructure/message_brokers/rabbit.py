@@ -1,9 +1,12 @@
-from dataclasses import dataclass
-from typing import AsyncIterator, Dict, Optional, Any
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterable, List, Optional, Any
 import aio_pika
-from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractQueue, AbstractExchange
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractIncomingMessage, AbstractQueue, AbstractExchange, AbstractQueueIterator
+from aio_pika.pool import Pool
 import orjson
-from .base import BaseMessageBroker
+from app.common.metrics import BROKER_CONSUMED, BROKER_PUBLISHED, BROKER_PUBLISH_DURATION
+from .base import BaseMessageBroker, ConsumedMessage
 from ..exceptions.message_broker import ConnectionNotInitializedException
 
 
@@ -14,13 +17,20 @@ class RabbitMQMessageBroker(BaseMessageBroker):
     channel: Optional[AbstractChannel] = None
     exchange: Optional[AbstractExchange] = None
     queue: Optional[AbstractQueue] = None
+    channel_pool: Optional[Pool[AbstractChannel]] = None
+    publisher_confirms: bool = True
+    channel_pool_size: int = 8
+    publish_batch_size: int = 500
+    prefetch_count: int = 32
+    max_priority: int = 9
     QUEUE_NAME: str = "main_queue"
     EXCHANGE_NAME: str = "main_exchange"
     is_initialized: bool = False
+    _iterators: List[AbstractQueueIterator] = field(default_factory=list, init=False, repr=False)
 
     @classmethod
-    def create(cls, url: str) -> 'RabbitMQMessageBroker':
-        return cls(url=url)
+    def create(cls, url: str, **options: Any) -> 'RabbitMQMessageBroker':
+        return cls(url=url, **options)
 
     async def ensure_connected(self) -> None:
         """
@@ -34,7 +44,7 @@ class RabbitMQMessageBroker(BaseMessageBroker):
         if not self.channel:
             self.connection = await aio_pika.connect_robust(self.url)
             self.channel = await self.connection.channel()
-            await self.channel.set_qos(prefetch_count=1)
+            await self.channel.set_qos(prefetch_count=self.prefetch_count)
 
             self.exchange = await self.channel.declare_exchange(
                 self.EXCHANGE_NAME,
@@ -44,43 +54,93 @@ class RabbitMQMessageBroker(BaseMessageBroker):
 
             self.queue = await self.channel.declare_queue(
                 self.QUEUE_NAME,
-                durable=True
+                durable=True,
+                arguments={"x-max-priority": self.max_priority} if self.max_priority else None,
             )
 
             await self.queue.bind(self.exchange, routing_key='#')
 
+            self.channel_pool = Pool(self._open_publish_channel, max_size=self.channel_pool_size)
+
+    async def _open_publish_channel(self) -> AbstractChannel:
+        """
+        Отдельные каналы для публикации: продюсеры не ждут друг друга и потребителя
+        """
+        return await self.connection.channel(publisher_confirms=self.publisher_confirms)
+
     async def close(self) -> None:
+        if self.channel_pool:
+            await self.channel_pool.close()
+            self.channel_pool = None
         if self.channel:
             await self.channel.close()
+            self.channel = None
         if self.connection and not self.connection.is_closed:
             await self.connection.close()
         self.is_initialized = False
 
-    async def send_message(self, routing_key: str, data: Any) -> None:
+    async def send_message(self, routing_key: str, data: Any, priority: int = 0) -> None:
         """
         Отправка сообщения в очередь
         :param routing_key: ключ маршрутизации (например: 'task.created')
         :param data: данные для отправки (будут сериализованы в JSON)
+        :param priority: приоритет сообщения, от 0 до max_priority
+        """
+        await self.send_messages(routing_key, [data], priority=priority)
+
+    async def send_messages(self, routing_key: str, data: Iterable[Any], priority: int = 0) -> None:
+        """
+        Пакетная отправка: публикации уходят в канал без ожидания друг друга,
+        подтверждения брокера (publisher confirms) ожидаются вместе пачками по publish_batch_size
+        :param routing_key: ключ маршрутизации (например: 'task.created')
+        :param data: набор данных для отправки, каждый элемент - отдельное сообщение
+        :param priority: приоритет всех сообщений пакета
         """
         await self.ensure_connected()
 
-        if not self.channel or not self.exchange:
+        if not self.channel_pool:
             raise ConnectionNotInitializedException("Broker not initialized")
 
-        message = aio_pika.Message(
+        messages = [self._build_message(item, priority) for item in data]
+        with BROKER_PUBLISH_DURATION.time(routing_key):
+            await self._publish(routing_key, messages)
+        BROKER_PUBLISHED.inc(routing_key, amount=len(messages))
+
+    async def _publish(self, routing_key: str, messages: List[aio_pika.Message]) -> None:
+        async with self.channel_pool.acquire() as channel:
+            exchange = await channel.get_exchange(self.EXCHANGE_NAME, ensure=False)
+            for offset in range(0, len(messages), self.publish_batch_size):
+                await asyncio.gather(*(
+                    exchange.publish(message, routing_key=routing_key)
+                    for message in messages[offset:offset + self.publish_batch_size]
+                ))
+
+    async def queue_depth(self) -> int:
+        """
+        Число готовых к доставке сообщений в очереди (пассивное объявление, очередь не создаётся)
+        """
+        await self.ensure_connected()
+
+        if not self.channel_pool:
+            raise ConnectionNotInitializedException("Broker not initialized")
+
+        async with self.channel_pool.acquire() as channel:
+            queue = await channel.declare_queue(self.QUEUE_NAME, passive=True)
+            return queue.declaration_result.message_count
+
+    @staticmethod
+    def _build_message(data: Any, priority: int = 0) -> aio_pika.Message:
+        return aio_pika.Message(
             body=orjson.dumps(data),
             content_type="application/json",
-            delivery_mode=aio_pika.DeliveryMode.PERSISTENT
-        )
-
-        await self.exchange.publish(
-            message,
-            routing_key=routing_key,
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            priority=priority,
         )
 
-    async def start_consuming(self) -> AsyncIterator[Dict]:
+    async def start_consuming(self) -> AsyncIterator[ConsumedMessage]:
         """
-        Начало потребления сообщений из очереди
+        Начало потребления сообщений из очереди. Каждый вызов - отдельный потребитель,
+        сообщения подтверждаются потребителем явно через ack()/nack()
         :return: генератор сообщений
         """
         await self.ensure_connected()
@@ -89,15 +149,31 @@ class RabbitMQMessageBroker(BaseMessageBroker):
             raise ConnectionNotInitializedException("Broker not initialized")
 
         async with self.queue.iterator() as queue_iter:
+            self._iterators.append(queue_iter)
             async for message in queue_iter:
-                async with message.process():
+                BROKER_CONSUMED.inc(message.routing_key or "")
+                try:
                     data = orjson.loads(message.body)
-                    routing_key = message.routing_key
-                    yield {
-                        'routing_key': routing_key,
-                        'data': data
-                    }
+                except orjson.JSONDecodeError:
+                    await message.reject(requeue=False)
+                    continue
+
+                yield ConsumedMessage(
+                    routing_key=message.routing_key,
+                    data=data,
+                    _ack=message.ack,
+                    _nack=self._nack_callback(message),
+                )
+
+    @staticmethod
+    def _nack_callback(message: AbstractIncomingMessage):
+        async def nack(requeue: bool) -> None:
+            await message.nack(requeue=requeue)
+        return nack
 
     async def stop_consuming(self) -> None:
-        if self.queue:
-            await self.queue.cancel(self.QUEUE_NAME)
+        # У каждого потребителя свой consumer tag: закрытие итератора отменяет его, и цикл async for завершается,
+        # а уже полученные, но не подтверждённые сообщения брокер вернёт в очередь при закрытии канала
+        iterators, self._iterators = self._iterators, []
+        for queue_iter in iterators:
+            await queue_iter.close()
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from typing import Any, Iterable, List
 
 from app.domain.entities.tasks import Task
 
@@ -15,9 +16,32 @@ class BaseTasksRepository(ABC):
         ...
 
     @abstractmethod
-    async def update(self, task_oid: str) -> None:
+    async def update(self, task: Task) -> None:
         ...
 
     @abstractmethod
     async def remove(self, task_oid: str) -> None:
         ...
+
+
+@dataclass
+class BaseOutboxRepository(ABC):
+    @abstractmethod
+    async def add(self, message: Any) -> None:
+        ...
+
+    @abstractmethod
+    async def add_many(self, messages: Iterable[Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def fetch_pending(self, limit: int) -> List[Any]:
+        ...
+
+    @abstractmethod
+    async def mark_sent(self, message_ids: Iterable[int]) -> None:
+        ...
+
+    @abstractmethod
+    async def count_pending(self) -> int:
+        ...
@@ -1,29 +1,146 @@
+import itertools
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
-from typing import List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Tuple
 
+from app.common.enums import Status
 from app.domain.entities.tasks import Task
+from app.domain.sql.models import Task as TaskModel
+from app.infrastructure.filters.tasks import ExportTasksFilters, GetTasksFilters, TasksCursor
 from app.infrastructure.repositories.base import BaseTasksRepository
 from app.services.exceptions.tasks import TaskNotFoundException
 
+# Позиция строки в порядке (create_time, id) - как в индексе ix_tasks_status_create_time_id
+OrderKey = Tuple[datetime, int]
+
 
 @dataclass
 class MemoryTasksRepository(BaseTasksRepository):
-    _tasks: List[Task] = field(default_factory=list, kw_only=True)
+    """Process-local drop-in for SQLAlchemyTasksRepository, holding TaskModel rows.
 
-    async def add(self, task: Task) -> None:
-        self._tasks.append(task)
+    Rows are keyed by oid, and every status keeps a sorted list of (create_time, id) keys, so get is
+    O(1) and a fetch_all page is a bisect plus a slice of limit rows, whatever the table size.
+    Rows changed in place are moved between status indexes on update() and bulk_update().
+    """
+    _rows: Dict[str, TaskModel] = field(default_factory=dict, init=False, repr=False)
+    _by_id: Dict[int, TaskModel] = field(default_factory=dict, init=False, repr=False)
+    _by_status: Dict[str, List[OrderKey]] = field(default_factory=dict, init=False, repr=False)
+    _indexed_status: Dict[str, str] = field(default_factory=dict, init=False, repr=False)
+    _ids: itertools.count = field(default_factory=lambda: itertools.count(1), init=False, repr=False)
 
-    async def get(self, task_oid: str) -> Task | None:
-        try:
-            return next(task for task in self._tasks if task.oid == task_oid)
-        except StopIteration:
-            return
+    async def add(self, task: TaskModel) -> None:
+        self._discard(task.task_oid)
+        if task.id is None:
+            task.id = next(self._ids)
+        key = (task.create_time, task.id)
+        self._rows[task.task_oid] = task
+        self._by_id[task.id] = task
+        # Новые задачи почти всегда самые свежие, поэтому insort сводится к добавлению в конец
+        insort(self._by_status.setdefault(task.status, []), key)
+        self._indexed_status[task.task_oid] = task.status
+
+    async def add_many(self, tasks: Iterable[Task]) -> None:
+        for task in tasks:
+            await self.add(TaskModel(
+                task_oid=task.oid,
+                description=task.description,
+                status=task.status,
+                priority=task.priority,
+                create_time=task.created_at,
+                start_time=task.start_time,
+                exec_time=task.exec_time,
+                run_at=task.run_at,
+                interval=task.interval,
+            ))
+
+    async def get(self, task_oid: str) -> TaskModel | None:
+        return self._rows.get(task_oid)
+
+    async def fetch_all(self, filters: GetTasksFilters) -> List[TaskModel]:
+        """Newest first with the same keyset cursor as the SQL repository."""
+        keys = self._by_status.get(filters.status, [])
+        end = len(keys)
+        if filters.cursor:
+            cursor = TasksCursor.decode(filters.cursor)
+            end = bisect_left(keys, (cursor.create_time, cursor.id))
+        start = max(end - filters.limit, 0)
+        return [self._by_id[id_] for _, id_ in reversed(keys[start:end])]
+
+    async def stream_all(self, filters: ExportTasksFilters, chunk_size: int = 1000) -> AsyncIterator[List[Dict[str, Any]]]:
+        # Порядок как в SQL-репозитории: по статусу - (create_time, id), без фильтра - по id.
+        # Снимок: изменения во время выгрузки не сдвигают уже выданные чанки
+        if filters.status:
+            ids = [id_ for _, id_ in self._by_status.get(filters.status, [])]
+        else:
+            ids = sorted(self._by_id)
+        for offset in range(0, len(ids), chunk_size):
+            yield [self._by_id[id_].to_dict() for id_ in ids[offset:offset + chunk_size]]
+
+    async def claim_due(self, now: datetime, limit: int, lease_expired_before: datetime) -> List[TaskModel]:
+        scheduled = [self._by_id[id_] for _, id_ in self._by_status.get(Status.scheduled.value, [])]
+        queued = [self._by_id[id_] for _, id_ in self._by_status.get(Status.in_queue.value, [])]
+        due = [row for row in scheduled if row.run_at is not None and row.run_at <= now]
+        due.extend(row for row in queued if row.claimed_at is not None and row.claimed_at < lease_expired_before)
+        claimed = sorted(due, key=lambda row: row.run_at)[:limit]
+        for row in claimed:
+            row.status = Status.in_queue.value
+            row.claimed_at = now
+            self._reindex(row)
+        return claimed
+
+    async def release_claimed(self, task_oids: Iterable[str]) -> None:
+        for task_oid in task_oids:
+            row = self._rows.get(task_oid)
+            if row is None or row.status != Status.in_queue.value or row.claimed_at is None:
+                continue
+            row.status = Status.scheduled.value
+            row.claimed_at = None
+            self._reindex(row)
 
-    async def update(self, task_oid: str) -> None:
-        ...
+    async def update(self, task: TaskModel) -> None:
+        self._reindex(task)
+
+    async def bulk_update(self, tasks: Iterable[Task]) -> None:
+        for task in tasks:
+            row = self._rows.get(task.oid)
+            if row is None:
+                continue
+            row.status = task.status
+            row.start_time = task.start_time
+            row.exec_time = task.exec_time
+            row.run_at = task.run_at
+            row.last_status = task.last_status
+            row.claimed_at = None
+            self._reindex(row)
 
     async def remove(self, task_oid: str) -> None:
-        task = next(task for task in self._tasks if task.oid == task_oid)
-        if not task:
+        if task_oid not in self._rows:
             raise TaskNotFoundException(task_oid)
-        self._tasks.remove(task)
+        self._discard(task_oid)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _reindex(self, row: TaskModel) -> None:
+        indexed_status = self._indexed_status.get(row.task_oid)
+        if indexed_status is None or indexed_status == row.status:
+            return
+        key = (row.create_time, row.id)
+        self._remove_key(self._by_status[indexed_status], key)
+        insort(self._by_status.setdefault(row.status, []), key)
+        self._indexed_status[row.task_oid] = row.status
+
+    def _discard(self, task_oid: str) -> None:
+        row = self._rows.pop(task_oid, None)
+        if row is None:
+            return
+        key = (row.create_time, row.id)
+        del self._by_id[row.id]
+        self._remove_key(self._by_status[self._indexed_status.pop(task_oid)], key)
+
+    @staticmethod
+    def _remove_key(keys: List[OrderKey], key: OrderKey) -> None:
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Type
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.sql.models import OutboxMessage
+from app.infrastructure.repositories.base import BaseOutboxRepository
+
+
+@dataclass
+class SQLAlchemyOutboxRepository(BaseOutboxRepository):
+    session: AsyncSession
+    model_class: Type[OutboxMessage]
+
+    async def add(self, message: OutboxMessage) -> None:
+        self.session.add(message)
+
+    async def add_many(self, messages: Iterable[OutboxMessage]) -> None:
+        rows = [
+            {"routing_key": message.routing_key, "priority": message.priority, "payload": message.payload}
+            for message in messages
+        ]
+        if rows:
+            await self.session.execute(insert(self.model_class), rows)
+
+    async def fetch_pending(self, limit: int) -> List[OutboxMessage]:
+        """Oldest unsent messages, locked so that concurrent relays take disjoint batches."""
+        query = (
+            select(self.model_class)
+            .where(self.model_class.sent_at.is_(None))
+            .order_by(self.model_class.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().fetchall())
+
+    async def mark_sent(self, message_ids: Iterable[int]) -> None:
+        query = (
+            update(self.model_class)
+            .where(self.model_class.id.in_(list(message_ids)))
+            .values(sent_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(query)
+
+    async def count_pending(self) -> int:
+        """Unsent messages; the count is served by the partial index ix_outbox_pending."""
+        query = select(func.count()).select_from(self.model_class).where(self.model_class.sent_at.is_(None))
+        result = await self.session.execute(query)
+        return result.scalar_one()
@@ -1,11 +1,14 @@
 from dataclasses import dataclass
-from typing import Type, List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Type, List
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import DateTime, Interval, String, Uuid, and_, cast, column, insert, or_, select, tuple_, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.enums import Status
 from app.domain.entities.tasks import Task
-from app.infrastructure.filters.tasks import GetTasksFilters
+from app.infrastructure.filters.tasks import ExportTasksFilters, GetTasksFilters, TasksCursor
 from app.infrastructure.repositories.base import BaseTasksRepository
 
 
@@ -17,22 +20,153 @@ class SQLAlchemyTasksRepository(BaseTasksRepository):
     async def add(self, task: Task) -> None:
         self.session.add(task)
 
+    async def add_many(self, tasks: Iterable[Task]) -> None:
+        """Inserts many tasks with one multi-row INSERT."""
+        rows = [
+            {
+                "task_oid": task.oid,
+                "description": task.description,
+                "status": task.status,
+                "priority": task.priority,
+                "create_time": task.created_at,
+                "start_time": task.start_time,
+                "exec_time": task.exec_time,
+                "run_at": task.run_at,
+                "interval": task.interval,
+            }
+            for task in tasks
+        ]
+        if rows:
+            await self.session.execute(insert(self.model_class), rows)
+
     async def get(self, task_oid: str) -> Task | None:
+        if not self._is_valid_oid(task_oid):
+            return None
         query = select(self.model_class).filter_by(task_oid=task_oid)
         result = await self.session.execute(query)
         return result.scalars().first()
 
     async def fetch_all(self, filters: GetTasksFilters) -> List[Task]:
+        """Newest first, paged by keyset on (create_time, id) so every page is one index range scan."""
         status = filters.status
         limit = filters.limit
 
-        query = select(self.model_class).filter_by(status=status).limit(limit)
+        query = select(self.model_class).filter_by(status=status)
+        if filters.cursor:
+            cursor = TasksCursor.decode(filters.cursor)
+            query = query.where(
+                tuple_(self.model_class.create_time, self.model_class.id) < (cursor.create_time, cursor.id)
+            )
+        query = query.order_by(self.model_class.create_time.desc(), self.model_class.id.desc()).limit(limit)
         result = await self.session.execute(query)
-        
+
+        return list(result.scalars().fetchall())
+
+    async def stream_all(self, filters: ExportTasksFilters, chunk_size: int = 1000) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yields plain row mappings in chunks from a server-side cursor, never holding the whole set.
+
+        Each path is ordered by an index, so the first chunk goes out without sorting the table first:
+        a status export by ix_tasks_status_create_time_id, the full export by the id primary key
+        (ids are assigned in insert order, so this is oldest first as well).
+        """
+        query = select(*self.model_class.__table__.columns)
+        if filters.status:
+            query = query.filter_by(status=filters.status).order_by(self.model_class.create_time, self.model_class.id)
+        else:
+            query = query.order_by(self.model_class.id)
+        query = query.execution_options(yield_per=chunk_size)
+
+        result = await self.session.stream(query)
+        async for rows in result.mappings().partitions():
+            yield [dict(row) for row in rows]
+
+    async def claim_due(self, now: datetime, limit: int, lease_expired_before: datetime) -> List[Task]:
+        """Moves up to limit due rows to In Queue under a claimed_at lease and returns them.
+
+        Due rows are Scheduled ones with run_at <= now, plus rows whose claim was taken before
+        lease_expired_before and never finished (the worker that claimed them died). Both are picked
+        through partial indexes with FOR UPDATE SKIP LOCKED, so any number of workers can claim at once
+        and each due row goes to exactly one of them.
+        """
+        due = (
+            select(self.model_class.id)
+            .where(or_(
+                and_(self.model_class.status == Status.scheduled.value, self.model_class.run_at <= now),
+                and_(
+                    self.model_class.status == Status.in_queue.value,
+                    self.model_class.claimed_at < lease_expired_before,
+                ),
+            ))
+            .order_by(self.model_class.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(self.model_class)
+            .where(self.model_class.id.in_(due.scalar_subquery()))
+            .values(status=Status.in_queue.value, claimed_at=now)
+            .returning(self.model_class)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(select(self.model_class).from_statement(query))
         return list(result.scalars().fetchall())
 
-    async def update(self, task_oid: str) -> None:
+    async def release_claimed(self, task_oids: Iterable[str]) -> None:
+        """Returns claimed rows that never ran to Scheduled, so any worker can claim them again."""
+        query = (
+            update(self.model_class)
+            .where(
+                self.model_class.task_oid.in_(list(task_oids)),
+                self.model_class.status == Status.in_queue.value,
+                self.model_class.claimed_at.is_not(None),
+            )
+            .values(status=Status.scheduled.value, claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(query)
+
+    async def update(self, task: Task) -> None:
         ...
 
+    async def bulk_update(self, tasks: Iterable[Task]) -> None:
+        """Writes status fields of many tasks with a single UPDATE ... FROM (VALUES ...)."""
+        rows = [(task.oid, task.status, task.start_time, task.exec_time, task.run_at, task.last_status) for task in tasks]
+        if not rows:
+            return
+
+        data = values(
+            column("task_oid", Uuid(as_uuid=False)),
+            column("status", String),
+            column("start_time", DateTime),
+            column("exec_time", Interval),
+            column("run_at", DateTime),
+            column("last_status", String),
+            name="data",
+        ).data(rows)
+        query = (
+            update(self.model_class)
+            .where(self.model_class.task_oid == data.c.task_oid)
+            .values(
+                status=data.c.status,
+                # NULL-литералы в VALUES не типизированы, поэтому приводим явно
+                start_time=cast(data.c.start_time, DateTime),
+                exec_time=cast(data.c.exec_time, Interval),
+                run_at=cast(data.c.run_at, DateTime),
+                last_status=cast(data.c.last_status, String),
+                # Статус записан - аренда забранной по сроку строки закончена
+                claimed_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(query)
+
     async def remove(self, task_oid: str) -> None:
         ...
+
+    @staticmethod
+    def _is_valid_oid(task_oid: str) -> bool:
+        try:
+            UUID(task_oid)
+        except (TypeError, ValueError):
+            return False
+        return True
@@ -1,17 +1,39 @@
+import time
 from contextlib import asynccontextmanager
-from typing import List
+from typing import Any, Callable, Dict, Optional, Type
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.domain.entities.tasks import Task
+from app.common.stats import LatencyWindow
+from app.infrastructure.repositories.base import BaseTasksRepository
+from app.infrastructure.uow.base import ModelT
 from app.infrastructure.uow.sample import UnitOfWork
 
 
 class SQLAlchemyUnitOfWork(UnitOfWork):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session_factory: async_sessionmaker, session: Optional[AsyncSession] = None):
         super().__init__()
+        self.session_factory = session_factory
         self.session = session
-        self.cache: List[Task] = list()
+        self.repository_factories: Dict[Type[ModelT], Callable[[AsyncSession], BaseTasksRepository]] = {}
+        self.checkout_wait = LatencyWindow()
+
+    def register_repository_factory(
+        self,
+        model_class: Type[ModelT],
+        factory: Callable[[AsyncSession], BaseTasksRepository],
+    ) -> None:
+        self.repository_factories[model_class] = factory
+
+    def scoped(self) -> "SQLAlchemyUnitOfWork":
+        """Unit of work bound to a fresh session, so concurrent transactions never share one."""
+        session = self.session_factory()
+        uow = SQLAlchemyUnitOfWork(self.session_factory, session)
+        uow.repository_factories = self.repository_factories
+        uow.checkout_wait = self.checkout_wait
+        for model_class, factory in self.repository_factories.items():
+            uow.register_repository(model_class, factory(session))
+        return uow
 
     async def commit(self) -> None:
         await super().commit()
@@ -22,21 +44,25 @@ class SQLAlchemyUnitOfWork(UnitOfWork):
 
     @asynccontextmanager
     async def transaction(self):
+        uow = self.scoped()
         try:
-            yield self
-            await self.commit()
+            started = time.perf_counter()
+            await uow.session.connection()
+            self.checkout_wait.observe(time.perf_counter() - started)
+
+            yield uow
+            await uow.commit()
         except Exception:
-            await self.rollback()
+            await uow.rollback()
             raise
         finally:
-            await self.session.close()
-
-    def push_to_cache(self, task: Task) -> None:
-        self.cache.append(task)
-
-    def remove_task_from_cache(self, current_task: Task) -> None:
-        [self.cache.pop() for task in self.cache if current_task == task]
+            await uow.session.close()
 
-    def get_task_from_cache(self, task_oid: str) -> Task | None:
-        task = [task for task in self.cache if task.oid == task_oid]
-        return task[0] if task else None
+    def pool_statistics(self) -> Dict[str, Any]:
+        pool = self.session_factory.kw["bind"].pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checkout_wait": self.checkout_wait.snapshot(),
+        }
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.domain.sql.models import OutboxMessage
+from app.infrastructure.message_brokers.base import BaseMessageBroker
+from app.infrastructure.uow.base import BaseUnitOfWork
+from app.services.events.manager import ThreadTaskQueueManager
+from app.services.exceptions.admission import TaskAdmissionRejectedException
+
+
+@dataclass(eq=False)
+class AdmissionController:
+    """Rejects new tasks once the backlog crosses a high-water mark.
+
+    The backlog adds up, sampled together at most every depth_refresh seconds:
+
+    - the broker queue depth from a passive declare, which counts ready messages only;
+    - pending outbox rows when uow is given, i.e. tasks committed but not yet relayed;
+    - tasks admitted since the last sample, and requests being admitted right now;
+    - messages delivered to consumers but not yet acked. Passive declare cannot see them, so they are
+      counted as the larger of the in-process ready queue (manager, only when this process runs the
+      worker) and unacked_allowance, normally prefetch_count x consumers of one worker.
+
+    With several standalone workers the unacked part is still counted for one of them, so the mark
+    should leave room for (workers - 1) x prefetch_count x consumers. Each priority can have its own
+    mark, so low priorities are shed first, and each client has a cap on concurrent requests.
+    """
+    broker: BaseMessageBroker
+    manager: Optional[ThreadTaskQueueManager] = None
+    uow: Optional[BaseUnitOfWork] = None
+    unacked_allowance: int = 0
+    enabled: bool = True
+    high_water_mark: int = 10_000
+    priority_limits: Dict[int, int] = field(default_factory=dict)
+    client_max_in_flight: int = 16
+    depth_refresh: float = 0.5
+    retry_after: int = 1
+    _broker_depth: int = field(default=0, init=False)
+    _outbox_depth: int = field(default=0, init=False)
+    _admitted_since_refresh: int = field(default=0, init=False)
+    _refreshed_at: float = field(default=float("-inf"), init=False)
+    _refresh_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    _in_flight: int = field(default=0, init=False)
+    _client_in_flight: Dict[str, int] = field(default_factory=lambda: defaultdict(int), init=False)
+    _rejected: Dict[str, int] = field(default_factory=lambda: defaultdict(int), init=False)
+
+    @asynccontextmanager
+    async def admit(self, priority: int, client: str, count: int = 1) -> AsyncIterator[None]:
+        """Holds a slot for the request body; raises TaskAdmissionRejectedException when overloaded."""
+        if not self.enabled:
+            yield
+            return
+
+        # get(), а не [] у defaultdict: иначе каждый отклонённый X-Client-Id оставлял бы в словаре запись
+        client_in_flight = self._client_in_flight.get(client, 0)
+        if client_in_flight >= self.client_max_in_flight:
+            self._reject("client", f"client {client} has {client_in_flight} requests in flight")
+
+        backlog = await self.backlog()
+        limit = self.priority_limits.get(priority, self.high_water_mark)
+        if backlog + count > limit:
+            self._reject(
+                "backlog",
+                f"backlog {backlog} + {count} new tasks exceeds {limit} for priority {priority}",
+                backlog=backlog,
+                limit=limit,
+            )
+
+        self._client_in_flight[client] += 1
+        self._in_flight += count
+        try:
+            yield
+            self._admitted_since_refresh += count
+        finally:
+            self._in_flight -= count
+            self._client_in_flight[client] -= 1
+            if not self._client_in_flight[client]:
+                del self._client_in_flight[client]
+
+    async def backlog(self) -> int:
+        await self._refresh_depth()
+        local_depth = self.manager.task_queue.qsize() if self.manager else 0
+        unacked = max(local_depth, self.unacked_allowance)
+        return self._broker_depth + self._outbox_depth + self._admitted_since_refresh + unacked + self._in_flight
+
+    def statistics(self) -> Dict[str, Any]:
+        return {
+            "broker_depth": self._broker_depth,
+            "outbox_depth": self._outbox_depth,
+            "in_flight": self._in_flight,
+            "clients_in_flight": len(self._client_in_flight),
+            "high_water_mark": self.high_water_mark,
+            "rejected": dict(self._rejected),
+        }
+
+    async def _refresh_depth(self) -> None:
+        if time.monotonic() - self._refreshed_at < self.depth_refresh:
+            return
+        # Один запрос к брокеру и базе на всех ожидающих: остальные используют только что полученное значение
+        async with self._refresh_lock:
+            if time.monotonic() - self._refreshed_at < self.depth_refresh:
+                return
+            # Задачи, принятые во время замера, могут в него не попасть, поэтому вычитаем только принятые до него
+            admitted = self._admitted_since_refresh
+            try:
+                broker_depth = await self.broker.queue_depth()
+                outbox_depth = 0
+                if self.uow:
+                    async with self.uow.transaction() as uow:
+                        outbox_depth = await uow.repository(OutboxMessage).count_pending()
+                self._broker_depth, self._outbox_depth = broker_depth, outbox_depth
+                self._admitted_since_refresh -= admitted
+            except Exception as e:
+                logging.error(f"Не удалось получить глубину очереди: {e}")
+            self._refreshed_at = time.monotonic()
+
+    def _reject(self, kind: str, reason: str, backlog: int = 0, limit: int = 0) -> None:
+        self._rejected[kind] += 1
+        # Чем глубже перегрузка относительно превышенного порога, тем дольше просим клиента подождать
+        overload = max(1.0, backlog / max(limit, 1))
+        raise TaskAdmissionRejectedException(reason=reason, retry_after=math.ceil(self.retry_after * overload))
@@ -1,7 +1,10 @@
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
 
 from app.common.enums import Status
 from app.domain.entities.tasks import Task
+from app.domain.events.tasks import NewTasksBatchCreatedEvent
 from app.services.commands.base import BaseCommand, CommandHandler
 
 
@@ -9,13 +12,47 @@ from app.services.commands.base import BaseCommand, CommandHandler
 class CreateTaskCommand(BaseCommand):
     description: str
     status: str = field(default=Status.in_queue.value)
+    priority: int = field(default=0)
+    run_at: Optional[datetime] = field(default=None)
+    interval: Optional[timedelta] = field(default=None)
 
 
 @dataclass(frozen=True)
 class CreateTaskCommandHandler(CommandHandler[CreateTaskCommand, Task]):
 
     async def handle(self, command: CreateTaskCommand) -> Task:
-        new_task = Task.create_task(status=command.status, description=command.description)
+        new_task = Task.create_task(
+            status=command.status,
+            description=command.description,
+            priority=command.priority,
+            run_at=command.run_at,
+            interval=command.interval,
+        )
 
         await self._mediator.publish(new_task.pull_events())
         return new_task
+
+
+@dataclass(frozen=True)
+class CreateTasksBatchCommand(BaseCommand):
+    descriptions: Sequence[str]
+    status: str = field(default=Status.in_queue.value)
+    priority: int = field(default=0)
+    run_at: Optional[datetime] = field(default=None)
+    interval: Optional[timedelta] = field(default=None)
+
+
+@dataclass(frozen=True)
+class CreateTasksBatchCommandHandler(CommandHandler[CreateTasksBatchCommand, List[Task]]):
+
+    async def handle(self, command: CreateTasksBatchCommand) -> List[Task]:
+        new_tasks = Task.create_tasks(
+            status=command.status,
+            descriptions=command.descriptions,
+            priority=command.priority,
+            run_at=command.run_at,
+            interval=command.interval,
+        )
+
+        await self._mediator.publish([NewTasksBatchCreatedEvent(tasks=new_tasks)])
+        return new_tasks
@@ -1,92 +1,394 @@
 import logging
 import asyncio
+import functools
+import multiprocessing
+import itertools
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
-from queue import Queue
+from collections import defaultdict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+from queue import Empty, PriorityQueue
 
-from app.domain.entities.tasks import Task
+from app.common.enums import ExecutorBackend, SchedulerMode, Status
+from app.common.metrics import EXECUTOR_WORKERS, TASK_EXEC_TIME, TASK_QUEUE_DEPTH
+from app.common.stats import LatencyWindow
+from app.domain.entities.tasks import Task, run_task_payload
 from app.domain.sql.models import Task as TaskModel
-from app.infrastructure.message_brokers.base import BaseMessageBroker
+from app.infrastructure.cache.base import BaseTaskCache
+from app.infrastructure.message_brokers.base import BaseMessageBroker, ConsumedMessage
 from app.infrastructure.uow.base import BaseUnitOfWork
+from app.services.events.status_sink import TaskStatusSink
+from app.services.events.timers import TimerHeap
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# (-priority, порядковый номер, время постановки, задача, сообщение): куча отдаёт старшие приоритеты первыми,
+# а внутри одного приоритета сохраняет FIFO. У задач, забранных из базы по сроку, сообщения нет (None)
+QueueEntry = Tuple[int, int, float, Task, Optional[ConsumedMessage]]
+
 
 class ThreadTaskQueueManager:
     def __init__(
         self,
         uow: BaseUnitOfWork,
         broker: BaseMessageBroker,
+        scheduler: SchedulerMode = SchedulerMode.thread,
+        workers: int = 8,
+        queue_size: int = 1000,
+        executor_backend: ExecutorBackend = ExecutorBackend.thread,
+        executor_workers: Optional[int] = None,
+        status_sink: Optional[TaskStatusSink] = None,
+        cache: Optional[BaseTaskCache] = None,
+        consumers: int = 1,
+        schedule_poll_interval: float = 1.0,
+        schedule_claim_limit: int = 100,
+        schedule_claim_timeout: float = 300.0,
+        stop_timeout: float = 20.0,
     ):
         self.uow = uow
         self.broker = broker
-        self.task_queue = Queue()
-        self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
-        self.executor: Optional[ThreadPoolExecutor] = None
+        self.scheduler = scheduler
+        self.workers = workers
+        self.executor_backend = executor_backend
+        self.executor_workers = executor_workers
+        self.status_sink = status_sink
+        self.cache = cache
+        self.consumers = consumers
+        self.schedule_poll_interval = schedule_poll_interval
+        self.schedule_claim_limit = schedule_claim_limit
+        self.schedule_claim_timeout = schedule_claim_timeout
+        self.queue_size = queue_size
+        self.task_queue: PriorityQueue | asyncio.PriorityQueue = (
+            asyncio.PriorityQueue(maxsize=queue_size) if scheduler is SchedulerMode.asyncio else PriorityQueue()
+        )
+        self.queue_wait: Dict[int, LatencyWindow] = defaultdict(LatencyWindow)
+        self._sequence = itertools.count()
+        self.timers = TimerHeap()
+        self._timers_changed = asyncio.Event()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.executor: Optional[Executor] = None
+        self._active_executions = 0
+        self.stop_timeout = stop_timeout
+        # Приём (потребители брокера и планировщик) и исполнение останавливаются раздельно
+        self._intake_tasks: List[asyncio.Task] = []
+        self._worker_tasks: List[asyncio.Task] = []
+        # Режим thread: выполняющиеся диспетчеризации и ограничитель их числа по размеру пула исполнителей
+        self._dispatches: Set[Future] = set()
+        self._dispatch_slots: Optional[threading.BoundedSemaphore] = None
+        # Выставляется после ожидания очереди в stop(): воркеры больше не берут из неё задачи
+        self._stopping = threading.Event()
+        # Забранные из базы по сроку задачи, чей статус ещё не записан: при остановке они возвращаются в Scheduled
+        self._claimed: Dict[str, Task] = {}
 
     async def start(self):
         logging.info("Запуск менеджера очереди задач")
-        self.executor = ThreadPoolExecutor()
+        self.loop = asyncio.get_running_loop()
+        self.executor = self._create_executor()
+        TASK_QUEUE_DEPTH.set_function(self._queue_depth_metric)
+        EXECUTOR_WORKERS.set_function(self._executor_workers_metric)
+        if self.status_sink:
+            await self.status_sink.start()
 
-        threading.Thread(target=self._process_queue, daemon=True).start()
+        self._stopping.clear()
+        if self.scheduler is SchedulerMode.asyncio:
+            self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        else:
+            self._dispatch_slots = threading.BoundedSemaphore(self._executor_capacity())
+            threading.Thread(target=self._process_queue, daemon=True).start()
 
-        asyncio.create_task(self._consume_messages())
+        self._intake_tasks = [asyncio.create_task(self._run_scheduler())]
+        self._intake_tasks.extend(asyncio.create_task(self._consume_messages()) for _ in range(self.consumers))
 
     async def stop(self):
         logging.info("Остановка менеджера очереди задач")
+        # Сначала прекращаем приём: новые сообщения остаются в брокере, планировщик больше не забирает строки
+        await self.broker.stop_consuming()
+        await self._cancel(self._intake_tasks)
+
+        # Уже принятые задачи дорабатывают, чтобы их результаты попали в TaskStatusSink
+        try:
+            await asyncio.wait_for(self._drain(), self.stop_timeout)
+        except asyncio.TimeoutError:
+            logging.warning(
+                f"Очередь не опустела за {self.stop_timeout} с: неподтверждённые задачи будут доставлены повторно"
+            )
+        self._stopping.set()
+
         if self.executor:
-            self.executor.shutdown(wait=True)
-            logging.info("Пул потоков успешно завершён")
+            # shutdown(wait=True) блокирует поток, поэтому ждём его вне цикла событий
+            shutdown = functools.partial(self.executor.shutdown, wait=True, cancel_futures=True)
+            await self.loop.run_in_executor(None, shutdown)
+            logging.info("Пул исполнителей успешно завершён")
+
+        # Отменяем только то, что не успело завершиться за отведённое время
+        for future in list(self._dispatches):
+            future.cancel()
+        await self._cancel(self._worker_tasks)
+        await self._release_claimed()
+
+        if self.status_sink:
+            await self.status_sink.stop()
+            logging.info("Отложенные обновления статусов записаны в базу данных")
+
+    async def _drain(self) -> None:
+        if self.scheduler is SchedulerMode.asyncio:
+            # task_done() вызывается воркером после _dispatch, поэтому join() ждёт и выполняющиеся задачи
+            await self.task_queue.join()
+            return
+        while self.task_queue.unfinished_tasks:
+            await asyncio.sleep(0.05)
+
+    async def _release_claimed(self) -> None:
+        if not self._claimed:
+            return
+        task_oids, self._claimed = list(self._claimed), {}
+        try:
+            async with self.uow.transaction() as uow:
+                await uow.repository(TaskModel).release_claimed(task_oids)
+            logging.info(f"Невыполненные задачи ({len(task_oids)}), забранные по сроку, возвращены в Scheduled")
+        except Exception as e:
+            logging.error(f"Не удалось вернуть забранные задачи, их заберут другие воркеры после истечения аренды: {e}")
+
+    @staticmethod
+    async def _cancel(tasks: List[asyncio.Task]) -> None:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        tasks.clear()
+
+    def _create_executor(self) -> Optional[Executor]:
+        if self.executor_backend is ExecutorBackend.process:
+            # spawn: дочерние процессы не наследуют потоки и event loop родителя
+            return ProcessPoolExecutor(
+                max_workers=self.executor_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        if self.executor_backend is ExecutorBackend.thread:
+            return ThreadPoolExecutor(max_workers=self.executor_workers)
+        return None
 
     def _process_queue(self):
+        while not self._stopping.is_set():
+            # Слот берётся до извлечения задачи: пока пул занят, задачи ждут в очереди, а не в цикле событий
+            if not self._dispatch_slots.acquire(timeout=0.2):
+                continue
+            try:
+                entry = self.task_queue.get(timeout=0.2)
+            except Empty:
+                self._dispatch_slots.release()
+                continue
+            if self._stopping.is_set():
+                # Остановка началась во время ожидания: сообщение задачи вернёт брокер, а забранную из базы
+                # строку stop() вернёт в Scheduled
+                self.task_queue.put(entry)
+                self.task_queue.task_done()
+                self._dispatch_slots.release()
+                break
+            try:
+                task, message = self._dequeued(entry)
+                logging.info(f"Задача {task.oid} извлечена из очереди и передана на выполнение")
+                future = asyncio.run_coroutine_threadsafe(self._dispatch(task, message), self.loop)
+                self._dispatches.add(future)
+                future.add_done_callback(self._dispatch_finished)
+            except Exception as e:
+                self.task_queue.task_done()
+                self._dispatch_slots.release()
+                logging.error(f"Ошибка при обработке очереди: {e}")
+
+    def _dispatch_finished(self, future: Future) -> None:
+        self._dispatches.discard(future)
+        self.task_queue.task_done()
+        self._dispatch_slots.release()
+
+    async def _worker(self):
         while True:
+            entry = await self.task_queue.get()
+            if self._stopping.is_set():
+                # Пул исполнителей уже закрывается: сообщение задачи вернёт брокер, а забранную из базы
+                # строку stop() вернёт в Scheduled
+                self.task_queue.put_nowait(entry)
+                self.task_queue.task_done()
+                return
+            task, message = self._dequeued(entry)
             try:
-                if not self.task_queue.empty():
-                    task = self.task_queue.get()
-                    logging.info(f"Задача {task.oid} извлечена из очереди и передана на выполнение")
-                    self.executor.submit(self._run_task, task)
-                time.sleep(0.2)
+                logging.info(f"Задача {task.oid} извлечена из очереди и передана на выполнение")
+                await self._dispatch(task, message)
             except Exception as e:
                 logging.error(f"Ошибка при обработке очереди: {e}")
+            finally:
+                self.task_queue.task_done()
+
+    async def _enqueue(self, task: Task, message: ConsumedMessage) -> None:
+        entry: QueueEntry = (-task.priority, next(self._sequence), time.monotonic(), task, message)
+        if self.scheduler is SchedulerMode.asyncio:
+            # Ограниченная очередь: при заполнении потребитель ждёт, а не раздувает память
+            await self.task_queue.put(entry)
+        else:
+            self.task_queue.put(entry)
+
+    def _dequeued(self, entry: QueueEntry) -> Tuple[Task, Optional[ConsumedMessage]]:
+        _, _, enqueued_at, task, message = entry
+        self.queue_wait[task.priority].observe(time.monotonic() - enqueued_at)
+        return task, message
+
+    def queue_statistics(self) -> Dict[str, Any]:
+        return {
+            "depth": self.task_queue.qsize(),
+            "scheduled": len(self.timers),
+            "wait": {priority: window.snapshot() for priority, window in sorted(self.queue_wait.items())},
+        }
+
+    def _queue_depth_metric(self) -> Dict[Tuple[str, ...], float]:
+        return {("ready",): self.task_queue.qsize(), ("scheduled",): len(self.timers)}
+
+    def _executor_capacity(self) -> int:
+        # inline-бэкенд ограничен только числом воркеров менеджера
+        return getattr(self.executor, "_max_workers", None) or self.workers
+
+    def _executor_workers_metric(self) -> Dict[Tuple[str, ...], float]:
+        capacity = self._executor_capacity()
+        return {("active",): self._active_executions, ("idle",): max(0, capacity - self._active_executions)}
 
     async def _consume_messages(self):
         logging.info("Начато потребление сообщений")
         async for message in self.broker.start_consuming():
-            routing_key = message['routing_key']
-            data = message['data']
-
-            if routing_key == 'task.created':
-                task = Task(
-                    oid=data['oid'],
-                    description=data['description'],
-                    status=data['status']
+            if message.routing_key != 'task.created':
+                await message.ack()
+                continue
+
+            try:
+                task = Task.from_payload(message.data)
+            except (KeyError, TypeError, ValueError) as e:
+                # Битое сообщение не должно останавливать потребителя: повторная доставка ничего не исправит
+                logging.error(f"Некорректное сообщение о создании задачи отброшено: {e!r}")
+                await message.nack(requeue=False)
+                continue
+            logging.info(f"Получено сообщение о создании задачи {task.oid}")
+            if task.is_scheduled:
+                # Задача уже записана в tasks со статусом Scheduled: в срок её заберёт из базы тот воркер,
+                # что успеет первым, поэтому сообщение не держим неподтверждённым
+                self._wake_at(task)
+                await message.ack()
+                continue
+            await self._enqueue(task, message)
+
+    def _wake_at(self, task: Task) -> None:
+        """Wakes the scheduler at a known run_at instead of the next poll; the task itself is claimed from the database."""
+        # Небольшой запас: loop.time() и datetime.now() - разные часы, проснуться раньше срока строки бессмысленно
+        delay = max(0.0, (task.run_at - datetime.now()).total_seconds()) + 0.01
+        deadline = self.loop.time() + delay
+        next_deadline = self.timers.next_deadline()
+        self.timers.push(task.oid, deadline, task.oid)
+        if next_deadline is None or deadline < next_deadline:
+            self._timers_changed.set()
+        logging.info(f"Задача {task.oid} запланирована на {task.run_at}")
+
+    async def _run_scheduler(self):
+        while True:
+            try:
+                await self._claim_due()
+            except Exception as e:
+                logging.error(f"Ошибка при выборке запланированных задач: {e}")
+            # Спим до ближайшего известного срока, но не дольше интервала опроса: задачи, запланированные
+            # через другие воркеры, этот процесс видит только в базе
+            timeout = self.schedule_poll_interval
+            next_deadline = self.timers.next_deadline()
+            if next_deadline is not None:
+                timeout = min(timeout, max(0.0, next_deadline - self.loop.time()))
+            try:
+                await asyncio.wait_for(self._timers_changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._timers_changed.clear()
+
+    async def _claim_due(self) -> None:
+        self.timers.pop_due(self.loop.time())
+        while True:
+            # Забираем не больше, чем помещается в очередь: остальное достанется воркерам со свободными местами
+            limit = min(self.schedule_claim_limit, self.queue_size - self.task_queue.qsize())
+            if limit <= 0:
+                return
+            now = datetime.now()
+            lease_expired_before = now - timedelta(seconds=self.schedule_claim_timeout)
+            async with self.uow.transaction() as uow:
+                rows = await uow.repository(TaskModel).claim_due(now, limit, lease_expired_before)
+            tasks = [
+                Task(
+                    oid=row.task_oid,
+                    description=row.description,
+                    status=row.status,
+                    priority=row.priority,
+                    run_at=row.run_at,
+                    interval=row.interval,
                 )
-                logging.info(f"Получено сообщение о создании задачи {task.oid}")
-                self.task_queue.put(task)
+                for row in rows
+            ]
+            # Запоминаем все сразу: если остановка прервёт постановку в очередь, stop() вернёт их в Scheduled
+            self._claimed.update((task.oid, task) for task in tasks)
+            for task in tasks:
+                logging.info(f"Наступил срок задачи {task.oid}")
+                await self._enqueue(task, None)
+            if len(rows) < limit:
+                return
+
+    async def _execute(self, task: Task) -> Task:
+        self._active_executions += 1
+        try:
+            if self.executor_backend is ExecutorBackend.inline:
+                return await task.run_task_async()
+            if self.executor_backend is ExecutorBackend.process:
+                result = await self.loop.run_in_executor(self.executor, run_task_payload, task.to_payload())
+                return task.apply_result(result)
+            return await self.loop.run_in_executor(self.executor, task.run_task)
+        finally:
+            self._active_executions -= 1
 
-    def _run_task(self, task: Task):
+    async def _dispatch(self, task: Task, message: Optional[ConsumedMessage]):
         try:
             logging.info(f"Начало выполнения задачи {task.oid}")
-            updated_task = task.run_task()
+            updated_task = await self._execute(task)
             logging.info(f"Задача {task.oid} выполнена. Статус: {updated_task.status}")
-            asyncio.run_coroutine_threadsafe(
-                self._async_update_task_in_db(updated_task),
-                self.loop
-            ).result()
-            logging.info(f"Статус задачи {task.oid} обновлен в базе данных")
+            TASK_EXEC_TIME.observe(updated_task.exec_time.total_seconds(), updated_task.status)
         except Exception as e:
             logging.error(f"Ошибка при выполнении задачи {task.oid}: {e}")
+            # Без записи статуса строка навсегда останется In Queue, а периодическая задача больше не запустится.
+            # Сообщение, как и при успехе, подтверждается только после записи
+            task.status = Status.failed.value
+            updated_task = task
 
-    async def _async_update_task_in_db(self, task: Task) -> None:
+        if updated_task.reschedule(datetime.now()):
+            # Строка снова станет Scheduled после записи статуса ниже, а следующий запуск заберёт любой воркер
+            self._wake_at(updated_task)
+
+        # Сообщение подтверждается только после записи статуса: при падении процесса брокер доставит его повторно
         try:
-            async with self.uow.transaction() as uow:
-                repository = uow.repository(TaskModel)
-                task_to_update = await repository.get(task.oid)
-                task_to_update.status = task.status
-                task_to_update.start_time = task.start_time
-                task_to_update.exec_time = task.exec_time
-                logging.info(f"Задача {task.oid} успешно обновлена в базе данных")
+            if self.status_sink:
+                await self.status_sink.put(updated_task, on_flushed=message.ack if message else None)
+                self._claimed.pop(task.oid, None)
+                logging.info(f"Статус задачи {task.oid} передан на пакетную запись")
+            else:
+                await self._async_update_task_in_db(updated_task)
+                self._claimed.pop(task.oid, None)
+                if message:
+                    await message.ack()
+                logging.info(f"Статус задачи {task.oid} обновлен в базе данных")
         except Exception as e:
             logging.error(f"Ошибка при обновлении задачи {task.oid} в базе данных: {e}")
+            if message:
+                await message.nack(requeue=True)
+
+    async def _async_update_task_in_db(self, task: Task) -> None:
+        async with self.uow.transaction() as uow:
+            repository = uow.repository(TaskModel)
+            task_to_update = await repository.get(task.oid)
+            task_to_update.status = task.status
+            task_to_update.start_time = task.start_time
+            task_to_update.exec_time = task.exec_time
+            task_to_update.run_at = task.run_at
+            task_to_update.last_status = task.last_status
+            task_to_update.claimed_at = None
+        if self.cache:
+            self.cache.invalidate([task.oid])
+        logging.info(f"Задача {task.oid} успешно обновлена в базе данных")
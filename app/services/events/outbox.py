@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.domain.sql.models import OutboxMessage
+from app.infrastructure.message_brokers.base import BaseMessageBroker
+from app.infrastructure.uow.base import BaseUnitOfWork
+
+
+@dataclass(eq=False)
+class OutboxRelay:
+    """Drains the transactional outbox to the broker in batches.
+
+    Each batch is published and marked as sent in one transaction; rows are locked with
+    SKIP LOCKED so several relays can run side by side. Delivery is at-least-once.
+    """
+    uow: BaseUnitOfWork
+    broker: BaseMessageBroker
+    batch_size: int = 500
+    poll_interval: float = 1.0
+    _wakeup: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _relay_task: Optional[asyncio.Task] = field(default=None, init=False)
+
+    async def start(self) -> None:
+        logging.info("Запуск ретранслятора outbox")
+        self._relay_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        logging.info("Остановка ретранслятора outbox")
+        if self._relay_task:
+            self._relay_task.cancel()
+            await asyncio.gather(self._relay_task, return_exceptions=True)
+            self._relay_task = None
+
+    def notify(self) -> None:
+        """Wakes the relay right away instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    async def relay_batch(self) -> int:
+        async with self.uow.transaction() as uow:
+            repository = uow.repository(OutboxMessage)
+            messages = await repository.fetch_pending(self.batch_size)
+            if not messages:
+                return 0
+
+            payloads: Dict[Tuple[str, int], List[Any]] = defaultdict(list)
+            for message in messages:
+                payloads[message.routing_key, message.priority].append(message.payload)
+            for (routing_key, priority), data in payloads.items():
+                await self.broker.send_messages(routing_key, data, priority=priority)
+
+            await repository.mark_sent(message.id for message in messages)
+        logging.info(f"Из outbox отправлено {len(messages)} сообщений")
+        return len(messages)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except Exception as e:
+                logging.error(f"Ошибка при отправке сообщений из outbox: {e}")
+                relayed = 0
+
+            if relayed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
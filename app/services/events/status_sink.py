@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.domain.entities.tasks import Task
+from app.domain.sql.models import Task as TaskModel
+from app.infrastructure.cache.base import BaseTaskCache
+from app.infrastructure.uow.base import BaseUnitOfWork
+
+
+@dataclass(eq=False)
+class TaskStatusSink:
+    """Write-behind buffer for task status updates.
+
+    Completed tasks are collected for up to ``flush_interval`` seconds or ``max_batch_size`` rows
+    and written with one bulk UPDATE in a single transaction. ``stop()`` flushes whatever is left.
+    ``on_flushed`` callbacks run only after the batch holding the task is committed.
+    """
+    uow: BaseUnitOfWork
+    max_batch_size: int = 500
+    flush_interval: float = 0.05
+    cache: Optional[BaseTaskCache] = None
+    _pending: Dict[str, Task] = field(default_factory=dict, init=False)
+    _callbacks: Dict[str, List[Callable[[], Awaitable[None]]]] = field(default_factory=dict, init=False)
+    _not_empty: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _full: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _flusher: Optional[asyncio.Task] = field(default=None, init=False)
+    _closing: bool = field(default=False, init=False)
+
+    async def start(self) -> None:
+        self._closing = False
+        self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._closing = True
+        self._not_empty.set()
+        self._full.set()
+        if self._flusher:
+            await self._flusher
+            self._flusher = None
+        await self.flush()
+
+    async def put(self, task: Task, on_flushed: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        # Повторное обновление той же задачи до сброса перезаписывает предыдущее
+        self._pending[task.oid] = task
+        if on_flushed:
+            self._callbacks.setdefault(task.oid, []).append(on_flushed)
+        self._not_empty.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+
+    async def flush(self) -> None:
+        while self._pending:
+            batch, callbacks = self._take_batch()
+            try:
+                async with self.uow.transaction() as uow:
+                    await uow.repository(TaskModel).bulk_update(batch)
+                if self.cache:
+                    # Сбрасывается кэш только этого процесса: при отдельном воркере кэш API отключён
+                    self.cache.invalidate(task.oid for task in batch)
+                logging.info(f"Статусы {len(batch)} задач обновлены в базе данных")
+            except Exception as e:
+                logging.error(f"Ошибка при пакетном обновлении статусов задач: {e}")
+                for task in batch:
+                    self._pending.setdefault(task.oid, task)
+                for oid, task_callbacks in callbacks.items():
+                    self._callbacks.setdefault(oid, []).extend(task_callbacks)
+                self._not_empty.set()
+                return
+            await self._run_callbacks(callbacks)
+
+    def _take_batch(self) -> Tuple[List[Task], Dict[str, List[Callable[[], Awaitable[None]]]]]:
+        oids = list(self._pending)[:self.max_batch_size]
+        batch = [self._pending.pop(oid) for oid in oids]
+        callbacks = {oid: self._callbacks.pop(oid) for oid in oids if oid in self._callbacks}
+        if not self._pending:
+            self._not_empty.clear()
+        if len(self._pending) < self.max_batch_size:
+            self._full.clear()
+        return batch, callbacks
+
+    @staticmethod
+    async def _run_callbacks(callbacks: Dict[str, List[Callable[[], Awaitable[None]]]]) -> None:
+        for oid, task_callbacks in callbacks.items():
+            for callback in task_callbacks:
+                try:
+                    await callback()
+                except Exception as e:
+                    logging.error(f"Ошибка в обработчике записи статуса задачи {oid}: {e}")
+
+    async def _run(self) -> None:
+        while not self._closing:
+            await self._not_empty.wait()
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
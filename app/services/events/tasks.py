@@ -1,21 +1,29 @@
 from dataclasses import dataclass
+from itertools import groupby
+from operator import attrgetter
+from typing import List, Optional
 
 from app.domain.entities.tasks import Task
-from app.domain.sql.models import Task as TaskModel
+from app.domain.sql.models import OutboxMessage, Task as TaskModel
 
-from app.domain.events.tasks import NewTaskCreatedEvent
+from app.domain.events.tasks import NewTaskCreatedEvent, NewTasksBatchCreatedEvent
 from app.infrastructure.message_brokers.base import BaseMessageBroker
 from app.infrastructure.uow.base import BaseUnitOfWork
+from app.services.events.outbox import OutboxRelay
 
 
 @dataclass
 class NewTaskCreatedEventHandler:
     broker: BaseMessageBroker
     uow: BaseUnitOfWork
+    outbox_relay: Optional[OutboxRelay] = None
 
     async def handle(self, event: NewTaskCreatedEvent) -> None:
         await self.__add_to_database(event.task)
-        await self.broker.send_message("task.created", event.task)
+        if self.outbox_relay:
+            self.outbox_relay.notify()
+        else:
+            await self.broker.send_message("task.created", event.task.to_payload(), priority=event.task.priority)
 
     async def __add_to_database(self, task: Task):
         async with self.uow.transaction() as uow:
@@ -25,6 +33,39 @@ class NewTaskCreatedEventHandler:
                 start_time=task.start_time,
                 create_time=task.created_at,
                 exec_time=task.exec_time,
-                status=task.status
+                status=task.status,
+                priority=task.priority,
+                run_at=task.run_at,
+                interval=task.interval,
             )
             )
+            if self.outbox_relay:
+                uow.register_new(OutboxMessage(
+                    routing_key="task.created",
+                    priority=task.priority,
+                    payload=task.to_payload(),
+                ))
+
+
+@dataclass
+class NewTasksBatchCreatedEventHandler:
+    broker: BaseMessageBroker
+    uow: BaseUnitOfWork
+    outbox_relay: Optional[OutboxRelay] = None
+
+    async def handle(self, event: NewTasksBatchCreatedEvent) -> None:
+        await self.__add_to_database(event.tasks)
+        if self.outbox_relay:
+            self.outbox_relay.notify()
+        else:
+            for priority, tasks in groupby(event.tasks, key=attrgetter("priority")):
+                await self.broker.send_messages("task.created", [task.to_payload() for task in tasks], priority=priority)
+
+    async def __add_to_database(self, tasks: List[Task]):
+        async with self.uow.transaction() as uow:
+            await uow.repository(TaskModel).add_many(tasks)
+            if self.outbox_relay:
+                await uow.repository(OutboxMessage).add_many(
+                    OutboxMessage(routing_key="task.created", priority=task.priority, payload=task.to_payload())
+                    for task in tasks
+                )
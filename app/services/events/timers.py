@@ -0,0 +1,67 @@
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional
+
+# Запись кучи: [срок, порядковый номер, ключ, значение]; список, а не dataclass, чтобы сравнение шло на уровне C.
+# Отменённая запись получает значение _CANCELLED и удаляется, когда оказывается на вершине
+_DEADLINE, _SEQUENCE, _KEY, _VALUE = range(4)
+_CANCELLED = object()
+
+
+@dataclass
+class TimerHeap:
+    """Min-heap of deadlines keyed by an id.
+
+    push and pop are O(log n). cancel only marks the entry and drops it from the index (O(1));
+    cancelled entries are skipped when they surface and the heap is rebuilt once they outnumber
+    the live ones, so memory stays proportional to the pending timers.
+    """
+    _heap: List[list] = field(default_factory=list, init=False, repr=False)
+    _index: Dict[Hashable, list] = field(default_factory=dict, init=False, repr=False)
+    _sequence: itertools.count = field(default_factory=itertools.count, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def push(self, key: Hashable, deadline: float, value: Any) -> None:
+        """Arms a timer; an existing timer with the same key is replaced."""
+        self.cancel(key)
+        entry = [deadline, next(self._sequence), key, value]
+        self._index[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def cancel(self, key: Hashable) -> bool:
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return False
+        entry[_VALUE] = _CANCELLED
+        if len(self._heap) > 2 * len(self._index) + 64:
+            self._compact()
+        return True
+
+    def next_deadline(self) -> Optional[float]:
+        self._drop_cancelled()
+        return self._heap[0][_DEADLINE] if self._heap else None
+
+    def pop_due(self, now: float) -> List[Any]:
+        """Removes and returns the values of all timers with deadline <= now, earliest first."""
+        due = []
+        heap = self._heap
+        while heap and heap[0][_DEADLINE] <= now:
+            entry = heapq.heappop(heap)
+            if entry[_VALUE] is not _CANCELLED:
+                del self._index[entry[_KEY]]
+                due.append(entry[_VALUE])
+        return due
+
+    def _drop_cancelled(self) -> None:
+        while self._heap and self._heap[0][_VALUE] is _CANCELLED:
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        self._heap = [entry for entry in self._heap if entry[_VALUE] is not _CANCELLED]
+        heapq.heapify(self._heap)
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+from app.services.exceptions.base import ServicesException
+
+
+@dataclass(eq=False)
+class TaskAdmissionRejectedException(ServicesException):
+    reason: str
+    retry_after: int
+
+    @property
+    def message(self):
+        return f"Task intake is overloaded, retry in {self.retry_after}s - {self.reason}"
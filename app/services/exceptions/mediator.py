@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import List
 
 from app.services.exceptions.base import ServicesException
 
@@ -19,3 +20,23 @@ class CommandHandlersNotRegistered(ServicesException):
     @property
     def message(self):
         return f"No command handlers registered - {self.command_type}"
+
+
+@dataclass(eq=False)
+class MediatorTimeoutException(ServicesException):
+    message_type: type
+    timeout: float
+
+    @property
+    def message(self):
+        return f"Handling took longer than {self.timeout}s - {self.message_type}"
+
+
+@dataclass(eq=False)
+class HandlersFailedException(ServicesException):
+    message_type: type
+    errors: List[Exception]
+
+    @property
+    def message(self):
+        return f"{len(self.errors)} handlers failed - {self.message_type}: {'; '.join(map(repr, self.errors))}"
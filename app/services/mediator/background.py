@@ -0,0 +1,40 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Set
+
+
+@dataclass(eq=False)
+class BackgroundDispatcher:
+    """Runs fire-and-forget handler calls with at most `limit` in flight.
+
+    submit waits for a free slot, so a burst slows the publisher down instead of piling up tasks.
+    """
+    limit: int = 100
+    _slots: asyncio.Semaphore = field(init=False, repr=False)
+    _tasks: Set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+    _failed: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self._slots = asyncio.Semaphore(self.limit)
+
+    async def submit(self, name: str, call: Callable[[], Awaitable[Any]]) -> None:
+        await self._slots.acquire()
+        task = asyncio.create_task(self._run(name, call))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self) -> None:
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def statistics(self) -> Dict[str, int]:
+        return {"in_flight": len(self._tasks), "limit": self.limit, "failed": self._failed}
+
+    async def _run(self, name: str, call: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await call()
+        except Exception as e:
+            self._failed += 1
+            logging.error(f"Ошибка фоновой обработки {name}: {e}")
+        finally:
+            self._slots.release()
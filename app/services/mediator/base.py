@@ -1,44 +1,148 @@
-from dataclasses import dataclass
-from typing import Iterable
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.common.enums import DispatchPolicy
 
 from app.domain.events.base import BaseEvent
 from app.services.commands.base import CR, CT, CommandHandler
 from app.services.events.base import ER, ET, EventHandler
-from app.services.exceptions.mediator import CommandHandlersNotRegistered, EventHandlersNotRegistered
+from app.services.exceptions.mediator import (
+    CommandHandlersNotRegistered,
+    EventHandlersNotRegistered,
+    HandlersFailedException,
+)
+from app.services.mediator.background import BackgroundDispatcher
 from app.services.mediator.command import CommandMediator
 from app.services.mediator.event import EventMediator
+from app.services.mediator.middlewares import BaseMediatorMiddleware, Call
 from app.services.mediator.query import QueryMediator
 from app.services.queries.base import QueryHandler, QT, QR
 
 
 @dataclass(eq=False)
 class Mediator(EventMediator, CommandMediator, QueryMediator):
-    def register_event(self, event: ET, event_handlers: Iterable[EventHandler[ET, ER]]) -> None:
+    """Dispatches through a dispatch table built at registration time.
+
+    Every registered message type maps to one callable: its handlers wrapped in the middleware chain,
+    so a call is a single dict lookup. Middlewares run outermost first, in list order.
+
+    Handlers of one message type run by its DispatchPolicy: one after another, all at once (latency of the
+    slowest handler, failures raised together), or in the background dispatcher without waiting for them.
+    """
+    middlewares: List[BaseMediatorMiddleware] = field(default_factory=list, kw_only=True)
+    policies: Dict[str, DispatchPolicy] = field(default_factory=dict, kw_only=True)
+    background: Optional[BackgroundDispatcher] = field(default=None, kw_only=True)
+    _policy_map: Dict[type, DispatchPolicy] = field(default_factory=dict, init=False, repr=False)
+    _event_dispatch: Dict[type, Call] = field(default_factory=dict, init=False, repr=False)
+    _command_dispatch: Dict[type, Call] = field(default_factory=dict, init=False, repr=False)
+    _query_dispatch: Dict[type, Call] = field(default_factory=dict, init=False, repr=False)
+
+    def register_event(
+        self,
+        event: ET,
+        event_handlers: Iterable[EventHandler[ET, ER]],
+        policy: Optional[DispatchPolicy] = None,
+    ) -> None:
         self.events_map[event].extend(event_handlers)
+        self._policy_map[event] = self._resolve_policy(event, policy)
+        if self.events_map[event]:
+            self._event_dispatch[event] = self._build_event_call(event)
 
     def register_query(self, query: QT, query_handler: QueryHandler[QT, QR]) -> None:
         self.queries_map[query] = query_handler
+        self._query_dispatch[query] = self._chain("query", query, query_handler.handle)
 
-    def register_command(self, command: CT, command_handlers: Iterable[CommandHandler[CT, CR]]) -> None:
+    def register_command(
+        self,
+        command: CT,
+        command_handlers: Iterable[CommandHandler[CT, CR]],
+        policy: Optional[DispatchPolicy] = None,
+    ) -> None:
+        resolved_policy = self._resolve_policy(command, policy)
+        if resolved_policy is DispatchPolicy.background:
+            # Результат команды нужен вызывающему, поэтому выполнять её в фоне нельзя.
+            # Проверка до изменения таблиц: медиатор не должен остаться зарегистрированным наполовину
+            raise ValueError(f"Commands cannot be dispatched in background - {command}")
         self.commands_map[command].extend(command_handlers)
+        self._policy_map[command] = resolved_policy
+        if self.commands_map[command]:
+            self._command_dispatch[command] = self._build_command_call(command)
+
+    def add_middleware(self, middleware: BaseMediatorMiddleware) -> None:
+        self.middlewares.append(middleware)
+        self._rebuild()
 
     async def publish(self, events: Iterable[BaseEvent]) -> Iterable[ER]:
         result = list()
 
         for event in events:
-            handlers: Iterable[EventHandler] = self.events_map[event.__class__]
-            if not handlers:
+            dispatch = self._event_dispatch.get(event.__class__)
+            if dispatch is None:
                 raise EventHandlersNotRegistered(event.__class__)
-            result.extend([await handler.handle(event) for handler in handlers])
+            result.extend(await dispatch(event))
         return result
 
     async def handle_command(self, command: CT) -> Iterable[CR]:
-        command_type = command.__class__
-        handlers = self.commands_map.get(command_type)
-        if not handlers:
-            raise CommandHandlersNotRegistered(command_type)
-
-        return [await handler.handle(command) for handler in handlers]
+        dispatch = self._command_dispatch.get(command.__class__)
+        if dispatch is None:
+            raise CommandHandlersNotRegistered(command.__class__)
+        return await dispatch(command)
 
     async def handle_query(self, query: QT) -> QR:
-        return await self.queries_map[query.__class__].handle(query)
+        return await self._query_dispatch[query.__class__](query)
+
+    def _resolve_policy(self, message_type: type, policy: Optional[DispatchPolicy]) -> DispatchPolicy:
+        return policy or self.policies.get(message_type.__name__, DispatchPolicy.sequential)
+
+    def _build_event_call(self, event_type: type) -> Call:
+        handle = self._handlers_call(event_type, tuple(self.events_map[event_type]))
+        return self._chain("publish", event_type, handle)
+
+    def _build_command_call(self, command_type: type) -> Call:
+        handle = self._handlers_call(command_type, tuple(self.commands_map[command_type]))
+        return self._chain("command", command_type, handle)
+
+    def _handlers_call(self, message_type: type, handlers: Sequence[Any]) -> Call:
+        policy = self._policy_map.get(message_type, DispatchPolicy.sequential)
+
+        async def sequential(message: Any) -> List[Any]:
+            return [await handler.handle(message) for handler in handlers]
+
+        async def concurrent(message: Any) -> List[Any]:
+            results = await asyncio.gather(*(handler.handle(message) for handler in handlers), return_exceptions=True)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if len(errors) == 1:
+                raise errors[0]
+            if errors:
+                raise HandlersFailedException(message_type, errors)
+            return results
+
+        async def background(message: Any) -> List[Any]:
+            await self.background.submit(message_type.__name__, lambda: concurrent(message))
+            return []
+
+        if policy is DispatchPolicy.background and self.background:
+            return background
+        if policy is DispatchPolicy.concurrent and len(handlers) > 1:
+            return concurrent
+        return sequential
+
+    def _chain(self, operation: str, message_type: type, call: Call) -> Call:
+        for middleware in reversed(self.middlewares):
+            call = middleware.wrap(operation, message_type, call)
+        return call
+
+    def _rebuild(self) -> None:
+        self._event_dispatch = {
+            event_type: self._build_event_call(event_type)
+            for event_type, handlers in self.events_map.items() if handlers
+        }
+        self._command_dispatch = {
+            command_type: self._build_command_call(command_type)
+            for command_type, handlers in self.commands_map.items() if handlers
+        }
+        self._query_dispatch = {
+            query_type: self._chain("query", query_type, handler.handle)
+            for query_type, handler in self.queries_map.items()
+        }
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.common.metrics import MEDIATOR_DURATION
+from app.services.exceptions.mediator import MediatorTimeoutException
+
+# Следующее звено цепочки: принимает команду, запрос или событие и возвращает результат обработчиков
+Call = Callable[[Any], Awaitable[Any]]
+
+
+@dataclass(eq=False)
+class BaseMediatorMiddleware(ABC):
+    """Wraps dispatch of one message type.
+
+    wrap is called once per (operation, message type) when the mediator builds its dispatch table,
+    so per-type state (labels, semaphores, limits) is resolved there and not on every call.
+    operation is one of "command", "query", "publish".
+    """
+
+    @abstractmethod
+    def wrap(self, operation: str, message_type: type, call_next: Call) -> Call:
+        ...
+
+
+@dataclass(eq=False)
+class TimingMiddleware(BaseMediatorMiddleware):
+    def wrap(self, operation: str, message_type: type, call_next: Call) -> Call:
+        name = message_type.__name__
+
+        async def timed(message: Any) -> Any:
+            with MEDIATOR_DURATION.time(operation, name):
+                return await call_next(message)
+
+        return timed
+
+
+@dataclass(eq=False)
+class SlowCallLoggingMiddleware(BaseMediatorMiddleware):
+    threshold: float = 1.0
+
+    def wrap(self, operation: str, message_type: type, call_next: Call) -> Call:
+        name = message_type.__name__
+
+        async def logged(message: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await call_next(message)
+            finally:
+                elapsed = time.perf_counter() - started
+                if elapsed >= self.threshold:
+                    logging.warning(f"Медленная обработка {operation} {name}: {elapsed:.3f} с")
+
+        return logged
+
+
+@dataclass(eq=False)
+class TimeoutMiddleware(BaseMediatorMiddleware):
+    """Cancels dispatch that runs longer than the timeout of its message type (by class name)."""
+    timeout: Optional[float] = None
+    timeouts: Dict[str, float] = field(default_factory=dict)
+
+    def wrap(self, operation: str, message_type: type, call_next: Call) -> Call:
+        timeout = self.timeouts.get(message_type.__name__, self.timeout)
+        if timeout is None:
+            return call_next
+
+        async def limited(message: Any) -> Any:
+            try:
+                return await asyncio.wait_for(call_next(message), timeout)
+            except asyncio.TimeoutError:
+                raise MediatorTimeoutException(message_type, timeout)
+
+        return limited
+
+
+@dataclass(eq=False)
+class ConcurrencyLimitMiddleware(BaseMediatorMiddleware):
+    """Caps concurrent dispatches per message type (by class name); types without a limit pass through.
+
+    Semaphores live on the middleware, so every mediator built with this instance shares the same limits.
+    """
+    limits: Dict[str, int] = field(default_factory=dict)
+    _semaphores: Dict[str, asyncio.Semaphore] = field(default_factory=dict, init=False, repr=False)
+
+    def wrap(self, operation: str, message_type: type, call_next: Call) -> Call:
+        name = message_type.__name__
+        limit = self.limits.get(name)
+        if not limit:
+            return call_next
+        semaphore = self._semaphores.setdefault(name, asyncio.Semaphore(limit))
+
+        async def bounded(message: Any) -> Any:
+            async with semaphore:
+                return await call_next(message)
+
+        return bounded
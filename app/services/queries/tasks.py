@@ -1,10 +1,11 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Any, AsyncIterator, Dict, List
 
 from app.domain.entities.tasks import Task
 
 from app.domain.sql.models import Task as TaskModel
-from app.infrastructure.filters.tasks import GetTasksFilters
+from app.infrastructure.cache.base import BaseTaskCache
+from app.infrastructure.filters.tasks import ExportTasksFilters, GetTasksFilters, TasksCursor
 from app.infrastructure.uow.base import BaseUnitOfWork
 from app.services.exceptions.tasks import TaskNotFoundException
 from app.services.queries.base import BaseQuery, QueryHandler
@@ -20,26 +21,58 @@ class GetTasksQuery(BaseQuery):
     filters: GetTasksFilters
 
 
+@dataclass(frozen=True)
+class ExportTasksQuery(BaseQuery):
+    filters: ExportTasksFilters
+
+
 @dataclass(frozen=True)
 class GetTaskDetailQueryHandler(QueryHandler):
     uow: BaseUnitOfWork
+    cache: BaseTaskCache
 
     async def handle(self, query: GetTaskDetailQuery) -> Task:
         task_oid = query.task_oid
+        cached_task = self.cache.get(task_oid)
+        if cached_task is not None:
+            return cached_task
+
         async with self.uow.transaction() as uow:
             repository = uow.repository(TaskModel)
             task = await repository.get(query.task_oid)
             if not task:
                 raise TaskNotFoundException(task_oid)
-        return task.to_dict()
+
+        task = task.to_dict()
+        self.cache.set(task_oid, task)
+        return task
 
 
 @dataclass(frozen=True)
 class GetTasksQueryHandler(QueryHandler):
     uow: BaseUnitOfWork
 
-    async def handle(self, query: GetTasksQuery) -> List[Task]:
+    async def handle(self, query: GetTasksQuery) -> Dict[str, Any]:
         async with self.uow.transaction() as uow:
             tasks = await uow.repository(TaskModel).fetch_all(query.filters)
-            tasks = [task.to_dict() for task in tasks]
-        return tasks
+
+        next_cursor = None
+        if tasks and len(tasks) == query.filters.limit:
+            last = tasks[-1]
+            next_cursor = TasksCursor(create_time=last.create_time, id=last.id).encode()
+        return {"items": [task.to_dict() for task in tasks], "next_cursor": next_cursor}
+
+
+@dataclass(frozen=True)
+class ExportTasksQueryHandler(QueryHandler):
+    uow: BaseUnitOfWork
+    chunk_size: int = 1000
+
+    async def handle(self, query: ExportTasksQuery) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._stream(query)
+
+    async def _stream(self, query: ExportTasksQuery) -> AsyncIterator[List[Dict[str, Any]]]:
+        # Транзакция живёт, пока клиент читает ответ: курсор на сервере требует открытой сессии
+        async with self.uow.transaction() as uow:
+            async for rows in uow.repository(TaskModel).stream_all(query.filters, self.chunk_size):
+                yield rows
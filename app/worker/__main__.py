@@ -0,0 +1,3 @@
+from app.worker.entrypoint import main
+
+main()
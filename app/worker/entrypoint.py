@@ -0,0 +1,42 @@
+import asyncio
+import logging
+import signal
+
+from app.common.enums import BrokerBackend
+from app.services.init import init_worker_dependencies
+from app.worker.metrics import start_metrics_server
+
+
+async def run_worker() -> None:
+    """Consumes and executes tasks until SIGINT or SIGTERM; any number of workers compete for one queue."""
+    dependencies = init_worker_dependencies()
+    if dependencies.config.broker_backend is BrokerBackend.memory:
+        raise RuntimeError("Standalone worker needs a shared broker, BROKER_BACKEND=memory is process-local")
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopping.set)
+
+    # У воркера нет API, поэтому TASK_EXEC_TIME, глубина очереди и прочие его метрики отдаются отдельным портом
+    metrics_server = None
+    if dependencies.config.worker_metrics_port:
+        metrics_server = await start_metrics_server("0.0.0.0", dependencies.config.worker_metrics_port)
+
+    await dependencies.broker.start()
+    await dependencies.manager.start()
+    logging.info("Воркер запущен")
+    try:
+        await stopping.wait()
+    finally:
+        # Как и в lifespan API: менеджер останавливается первым, чтобы отложенные ack/nack ушли до закрытия канала
+        await dependencies.manager.stop()
+        await dependencies.broker.close()
+        if metrics_server:
+            metrics_server.close()
+            await metrics_server.wait_closed()
+        logging.info("Воркер остановлен")
+
+
+def main() -> None:
+    asyncio.run(run_worker())
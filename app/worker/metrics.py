@@ -0,0 +1,35 @@
+import asyncio
+import logging
+
+from app.common.metrics import REGISTRY
+
+_CONTENT_TYPE = b"text/plain; version=0.0.4; charset=utf-8"
+
+
+async def start_metrics_server(host: str, port: int) -> asyncio.AbstractServer:
+    """Serves GET /metrics from REGISTRY, the worker's counterpart of the API /metrics route."""
+    server = await asyncio.start_server(_handle, host, port)
+    logging.info(f"Метрики воркера доступны на {host}:{port}/metrics")
+    return server
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), 5)
+        # Заголовки не нужны, но их нужно дочитать до пустой строки
+        while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+            pass
+        method, path, *_ = request_line.decode("latin-1").split() or ("", "")
+        if method == "GET" and path.split("?", 1)[0] == "/metrics":
+            status, content_type, body = b"200 OK", _CONTENT_TYPE, REGISTRY.render().encode()
+        else:
+            status, content_type, body = b"404 Not Found", b"text/plain; charset=utf-8", b"Not Found\n"
+        writer.write(
+            b"HTTP/1.1 " + status + b"\r\nContent-Type: " + content_type
+            + b"\r\nContent-Length: " + str(len(body)).encode() + b"\r\nConnection: close\r\n\r\n" + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
@@ -0,0 +1,58 @@
+"""Per-task cost of POST /tasks versus POST /tasks/batch against the live database and broker.
+
+Run inside the application container (``make app-shell``)::
+
+    python -m benchmarks.create_tasks --count 500 --batch-size 100
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from app.infrastructure.message_brokers.base import BaseMessageBroker
+from app.services.commands.tasks import CreateTaskCommand, CreateTasksBatchCommand
+from app.services.init import init_container
+from app.services.mediator.base import Mediator
+
+
+async def measure_single(mediator: Mediator, count: int) -> float:
+    started = time.perf_counter()
+    for number in range(count):
+        await mediator.handle_command(CreateTaskCommand(description=f"benchmark single {number}"))
+    return (time.perf_counter() - started) / count
+
+
+async def measure_batch(mediator: Mediator, count: int, batch_size: int) -> float:
+    started = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        descriptions = [f"benchmark batch {number}" for number in range(offset, min(offset + batch_size, count))]
+        await mediator.handle_command(CreateTasksBatchCommand(descriptions=descriptions))
+    return (time.perf_counter() - started) / count
+
+
+async def main(count: int, batch_size: int) -> None:
+    container = init_container()
+    broker: BaseMessageBroker = container.resolve(BaseMessageBroker)
+    await broker.start()
+    try:
+        mediator: Mediator = container.resolve(Mediator)
+        single = await measure_single(mediator, count)
+        batch = await measure_batch(mediator, count, batch_size)
+    finally:
+        await broker.close()
+
+    print(json.dumps({
+        "count": count,
+        "batch_size": batch_size,
+        "single_ms_per_task": round(single * 1000, 4),
+        "batch_ms_per_task": round(batch * 1000, 4),
+        "speedup": round(single / batch, 2) if batch else None,
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.batch_size))
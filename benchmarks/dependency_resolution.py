@@ -0,0 +1,81 @@
+"""Per-request cost of getting the mediator: punq resolution versus the compiled dependency graph.
+
+"before" repeats what every request used to do: a sync Depends(init_container), which FastAPI runs in
+its thread pool, followed by container.resolve(Mediator) rebuilding the mediator and its handlers.
+"after" is the async Depends(get_mediator) attribute lookup. Needs neither the database nor the broker::
+
+    python -m benchmarks.dependency_resolution --iterations 5000 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from punq import Container
+
+from app.application.api.dependencies import get_mediator
+from app.common.stats import LatencyWindow
+from app.services.init import _build_mediator, init_container, init_dependencies
+from app.services.mediator.base import Mediator
+
+
+def measure_resolve(iterations: int) -> dict:
+    container = init_container()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        _build_mediator(container)
+    before = (time.perf_counter() - started) / iterations
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        init_dependencies().mediator
+    after = (time.perf_counter() - started) / iterations
+    return {"before_us": round(before * 1e6, 3), "after_us": round(after * 1e6, 3)}
+
+
+def create_benchmark_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before")
+    async def before(container: Container = Depends(init_container)) -> None:
+        _build_mediator(container)
+
+    @app.get("/after")
+    async def after(mediator: Mediator = Depends(get_mediator)) -> None:
+        ...
+
+    return app
+
+
+async def measure_requests(requests: int) -> dict:
+    transport = httpx.ASGITransport(app=create_benchmark_app())
+    result = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for path in ("/before", "/after"):
+            await client.get(path)
+            window = LatencyWindow(size=requests)
+            for _ in range(requests):
+                started = time.perf_counter()
+                await client.get(path)
+                window.observe(time.perf_counter() - started)
+            snapshot = window.snapshot()
+            name = path.strip("/")
+            result[f"{name}_p50_us"] = round(snapshot["p50"] * 1e6, 1)
+            result[f"{name}_p99_us"] = round(snapshot["p99"] * 1e6, 1)
+    return result
+
+
+async def main(iterations: int, requests: int) -> None:
+    init_dependencies()
+    print(json.dumps({"resolve": measure_resolve(iterations)}))
+    print(json.dumps({"request": await measure_requests(requests)}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.requests))
@@ -0,0 +1,62 @@
+"""In-process stand-ins for the database, so the pipeline can be measured offline.
+
+Tasks live in the real MemoryTasksRepository and the broker side uses the real InMemoryMessageBroker.
+"""
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from app.domain.sql.models import OutboxMessage, Task as TaskModel
+from app.infrastructure.repositories.base import BaseOutboxRepository
+from app.infrastructure.repositories.memory import MemoryTasksRepository
+from app.infrastructure.uow.sample import UnitOfWork
+
+
+@dataclass
+class FakeOutboxRepository(BaseOutboxRepository):
+    messages: List[OutboxMessage] = field(default_factory=list)
+
+    async def add(self, message: OutboxMessage) -> None:
+        self.messages.append(message)
+
+    async def add_many(self, messages: Iterable[OutboxMessage]) -> None:
+        self.messages.extend(messages)
+
+    async def fetch_pending(self, limit: int) -> List[OutboxMessage]:
+        return [message for message in self.messages if message.sent_at is None][:limit]
+
+    async def mark_sent(self, message_ids: Iterable[int]) -> None:
+        ids = set(message_ids)
+        for message in self.messages:
+            if message.id in ids:
+                message.sent_at = datetime.now()
+
+    async def count_pending(self) -> int:
+        return sum(message.sent_at is None for message in self.messages)
+
+
+class FakeUnitOfWork(UnitOfWork):
+    """Unit of work over the fake repositories; every transaction shares them."""
+
+    def __init__(self):
+        super().__init__()
+        self.tasks = MemoryTasksRepository()
+        self.outbox = FakeOutboxRepository()
+        self.register_repository(TaskModel, self.tasks)
+        self.register_repository(OutboxMessage, self.outbox)
+
+    @asynccontextmanager
+    async def transaction(self):
+        uow = FakeUnitOfWork.__new__(FakeUnitOfWork)
+        UnitOfWork.__init__(uow)
+        uow.repositories = self.repositories
+        try:
+            yield uow
+            await uow.commit()
+        except Exception:
+            await uow.rollback()
+            raise
+
+    def pool_statistics(self) -> Dict[str, Any]:
+        return {}
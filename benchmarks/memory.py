@@ -0,0 +1,72 @@
+"""Memory footprint of in-flight tasks, measured with tracemalloc.
+
+Builds a backlog of tasks the way each side of the pipeline holds them and prints bytes per task as JSON:
+
+- queued_task: Task.from_payload plus its ThreadTaskQueueManager queue entry, what a consumer keeps per message
+- created_task: Task.create_task with its NewTaskCreatedEvent still registered, what the API side holds
+
+    python -m benchmarks.memory --tasks 100000
+"""
+import argparse
+import gc
+import itertools
+import json
+import platform
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from app.common.enums import Status
+from app.domain.entities.tasks import Task
+from benchmarks.pipeline import current_commit
+
+
+def measure(name: str, build: Callable[[List[Any]], List[Any]], inputs: List[Any]) -> Dict[str, Any]:
+    """Bytes still allocated by build(inputs) per input; inputs are made before tracing starts."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        backlog = build(inputs)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del backlog
+    return {"name": name, "tasks": len(inputs), "bytes_per_task": round(allocated / len(inputs), 1)}
+
+
+def queued_tasks(payloads: List[Dict[str, Any]]) -> List[Any]:
+    sequence = itertools.count()
+    entries = []
+    for payload in payloads:
+        task = Task.from_payload(payload)
+        entries.append((-task.priority, next(sequence), time.monotonic(), task, None))
+    return entries
+
+
+def created_tasks(descriptions: List[str]) -> List[Any]:
+    return [Task.create_task(Status.in_queue.value, description) for description in descriptions]
+
+
+def main(count: int) -> None:
+    descriptions = [f"benchmark {number}" for number in range(count)]
+    # Payload живут в менеджере только до разбора сообщения, поэтому строятся до замера
+    payloads = [
+        Task.create_task(Status.in_queue.value, description, priority=number % 10).to_payload()
+        for number, description in enumerate(descriptions)
+    ]
+    report = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "results": [
+            measure("queued_task", queued_tasks, payloads),
+            measure("created_task", created_tasks, descriptions),
+        ],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.tasks)
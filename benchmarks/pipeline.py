@@ -0,0 +1,316 @@
+"""Offline benchmark suite for the task pipeline.
+
+Runs every stage against the in-process fakes from ``benchmarks.fakes`` and the in-memory broker
+(no database, no RabbitMQ) and prints one JSON document with ops/s, p50 and p99 per case. Save it with ``--output`` and pass
+an earlier file to ``--compare`` to see the ops/s ratio against another commit::
+
+    python -m benchmarks.pipeline --iterations 5000 --output before.json
+    python -m benchmarks.pipeline --iterations 5000 --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.application.api.responses import TaskJSONResponse, project
+from app.application.tasks.schemas import TaskSchema
+from app.common.enums import ExecutorBackend, SchedulerMode, Status
+from app.common.stats import LatencyWindow
+from app.domain.entities.tasks import Task
+from app.domain.events.tasks import NewTaskCreatedEvent
+from app.domain.sql.models import Task as TaskModel
+from app.infrastructure.filters.tasks import GetTasksFilters
+from app.infrastructure.message_brokers.base import ConsumedMessage
+from app.infrastructure.message_brokers.memory import InMemoryMessageBroker
+from app.infrastructure.message_brokers.rabbit import RabbitMQMessageBroker
+from app.services.commands.base import BaseCommand, CommandHandler
+from app.services.commands.tasks import CreateTaskCommand, CreateTaskCommandHandler
+from app.services.events.manager import ThreadTaskQueueManager
+from app.services.events.status_sink import TaskStatusSink
+from app.services.events.tasks import NewTaskCreatedEventHandler
+from app.services.mediator.base import Mediator
+from app.services.mediator.middlewares import (
+    ConcurrencyLimitMiddleware,
+    SlowCallLoggingMiddleware,
+    TimeoutMiddleware,
+    TimingMiddleware,
+)
+from benchmarks.fakes import FakeUnitOfWork
+
+SEED_ROWS = 10_000
+
+
+@dataclass(frozen=True)
+class NoopCommand(BaseCommand):
+    ...
+
+
+@dataclass(frozen=True)
+class NoopCommandHandler(CommandHandler[NoopCommand, None]):
+    async def handle(self, command: NoopCommand) -> None:
+        ...
+
+
+class InstantExecutionManager(ThreadTaskQueueManager):
+    """Manager whose tasks take no time to run, so only the pipeline around them is measured."""
+
+    async def _execute(self, task: Task) -> Task:
+        task.start_time = datetime.now()
+        task.exec_time = timedelta(0)
+        task.status = Status.completed.value
+        return task
+
+
+def create_manager(uow: FakeUnitOfWork, broker: InMemoryMessageBroker) -> ThreadTaskQueueManager:
+    return InstantExecutionManager(
+        uow,
+        broker=broker,
+        scheduler=SchedulerMode.asyncio,
+        executor_backend=ExecutorBackend.inline,
+        status_sink=TaskStatusSink(uow),
+        consumers=2,
+    )
+
+
+def create_mediator() -> Mediator:
+    # Тот же набор middleware, что и в приложении, с настройками по умолчанию
+    return Mediator(middlewares=[
+        TimingMiddleware(),
+        SlowCallLoggingMiddleware(),
+        ConcurrencyLimitMiddleware(),
+        TimeoutMiddleware(),
+    ])
+
+
+def result(name: str, iterations: int, elapsed: float, window: LatencyWindow) -> Dict[str, Any]:
+    snapshot = window.snapshot()
+    return {
+        "name": name,
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / elapsed, 1),
+        "p50_us": round(snapshot["p50"] * 1e6, 2),
+        "p99_us": round(snapshot["p99"] * 1e6, 2),
+    }
+
+
+async def measure(name: str, call: Callable[[], Awaitable[Any]], iterations: int) -> Dict[str, Any]:
+    for _ in range(min(iterations, 100)):
+        await call()
+    window = LatencyWindow(size=iterations)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        await call()
+        window.observe(time.perf_counter() - call_started)
+    return result(name, iterations, time.perf_counter() - started, window)
+
+
+async def bench_mediator_dispatch(iterations: int) -> Dict[str, Any]:
+    mediator = create_mediator()
+    mediator.register_command(NoopCommand, [NoopCommandHandler(_mediator=mediator)])
+    command = NoopCommand()
+    return await measure("mediator_dispatch", lambda: mediator.handle_command(command), iterations)
+
+
+async def bench_create_task(iterations: int) -> Dict[str, Any]:
+    mediator = create_mediator()
+    uow = FakeUnitOfWork()
+    broker = InMemoryMessageBroker(queue_size=iterations + 100)
+    mediator.register_command(CreateTaskCommand, [CreateTaskCommandHandler(_mediator=mediator)])
+    mediator.register_event(NewTaskCreatedEvent, [NewTaskCreatedEventHandler(broker=broker, uow=uow)])
+    command = CreateTaskCommand(description="benchmark")
+    return await measure("create_task_command", lambda: mediator.handle_command(command), iterations)
+
+
+async def seeded_uow() -> Tuple[FakeUnitOfWork, List[str]]:
+    uow = FakeUnitOfWork()
+    statuses = [status.value for status in Status]
+    tasks = [Task(description=f"benchmark {number}", status=random.choice(statuses)) for number in range(SEED_ROWS)]
+    await uow.tasks.add_many(tasks)
+    return uow, [task.oid for task in tasks]
+
+
+async def bench_repository_get(iterations: int) -> Dict[str, Any]:
+    uow, oids = await seeded_uow()
+
+    async def get() -> None:
+        async with uow.transaction() as scoped:
+            await scoped.repository(TaskModel).get(random.choice(oids))
+
+    return await measure("repository_get", get, iterations)
+
+
+async def bench_repository_fetch_all(iterations: int) -> Dict[str, Any]:
+    uow, _ = await seeded_uow()
+    filters = GetTasksFilters(limit=50, status=Status.completed.value)
+
+    async def fetch_all() -> None:
+        async with uow.transaction() as scoped:
+            await scoped.repository(TaskModel).fetch_all(filters)
+
+    return await measure("repository_fetch_all", fetch_all, iterations)
+
+
+async def bench_task_serialization(iterations: int) -> Dict[str, Any]:
+    uow, oids = await seeded_uow()
+    row = await uow.tasks.get(oids[0])
+    row.start_time = datetime.now()
+    row.exec_time = timedelta(seconds=3)
+
+    async def serialize() -> None:
+        TaskSchema(**row.to_dict()).model_dump_json()
+
+    return await measure("task_to_dict_schema", serialize, iterations)
+
+
+async def bench_task_page_json(iterations: int) -> Dict[str, Any]:
+    uow, _ = await seeded_uow()
+    rows = await uow.tasks.fetch_all(GetTasksFilters(limit=50, status=Status.completed.value))
+
+    async def render() -> None:
+        TaskJSONResponse([project(row.to_dict(), TaskSchema) for row in rows])
+
+    return await measure("task_page_json", render, iterations)
+
+
+async def bench_broker_codec(iterations: int) -> Dict[str, Any]:
+    payload = Task.create_task(Status.in_queue.value, "benchmark", priority=5).to_payload()
+
+    async def round_trip() -> None:
+        message = RabbitMQMessageBroker._build_message(payload, priority=5)
+        Task.from_payload(orjson.loads(message.body))
+
+    return await measure("broker_encode_decode", round_trip, iterations)
+
+
+async def bench_manager_dispatch(iterations: int) -> Dict[str, Any]:
+    manager = create_manager(FakeUnitOfWork(), InMemoryMessageBroker())
+    window = LatencyWindow(size=iterations)
+    done = asyncio.Event()
+    acked = 0
+
+    def message_for(enqueued_at: float) -> ConsumedMessage:
+        async def ack() -> None:
+            nonlocal acked
+            window.observe(time.perf_counter() - enqueued_at)
+            acked += 1
+            if acked == iterations:
+                done.set()
+
+        async def nack(requeue: bool) -> None:
+            ...
+
+        return ConsumedMessage(routing_key="task.created", data=None, _ack=ack, _nack=nack)
+
+    await manager.start()
+    try:
+        started = time.perf_counter()
+        for number in range(iterations):
+            task = Task(description=f"benchmark {number}", status=Status.in_queue.value)
+            await manager._enqueue(task, message_for(time.perf_counter()))
+        await done.wait()
+        elapsed = time.perf_counter() - started
+    finally:
+        await manager.stop()
+    return result("manager_dispatch", iterations, elapsed, window)
+
+
+async def bench_end_to_end(iterations: int) -> Dict[str, Any]:
+    """create command -> outbox-less publish -> in-memory broker -> manager -> status sink -> ack."""
+    uow = FakeUnitOfWork()
+    broker = InMemoryMessageBroker()
+    mediator = create_mediator()
+    mediator.register_command(CreateTaskCommand, [CreateTaskCommandHandler(_mediator=mediator)])
+    mediator.register_event(NewTaskCreatedEvent, [NewTaskCreatedEventHandler(broker=broker, uow=uow)])
+    manager = create_manager(uow, broker)
+    window = LatencyWindow(size=iterations)
+
+    await broker.start()
+    await manager.start()
+    try:
+        started = time.perf_counter()
+        for number in range(iterations):
+            call_started = time.perf_counter()
+            await mediator.handle_command(CreateTaskCommand(description=f"benchmark {number}"))
+            window.observe(time.perf_counter() - call_started)
+        while broker.statistics()["acked"] < iterations:
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - started
+    finally:
+        await manager.stop()
+        await broker.close()
+    return result("pipeline_end_to_end", iterations, elapsed, window)
+
+
+BENCHMARKS: List[Callable[[int], Awaitable[Dict[str, Any]]]] = [
+    bench_mediator_dispatch,
+    bench_create_task,
+    bench_repository_get,
+    bench_repository_fetch_all,
+    bench_task_serialization,
+    bench_task_page_json,
+    bench_broker_codec,
+    bench_manager_dispatch,
+    bench_end_to_end,
+]
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> Dict[str, float]:
+    with open(baseline_path, "rb") as baseline_file:
+        baseline = {case["name"]: case for case in orjson.loads(baseline_file.read())["results"]}
+    return {
+        case["name"]: round(case["ops_per_sec"] / baseline[case["name"]]["ops_per_sec"], 3)
+        for case in results if case["name"] in baseline
+    }
+
+
+async def main(iterations: int, only: Optional[str], output: Optional[str], baseline: Optional[str]) -> None:
+    results = [
+        await benchmark(iterations)
+        for benchmark in BENCHMARKS
+        if not only or only in benchmark.__name__
+    ]
+    report = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "results": results,
+    }
+    if baseline:
+        report["ops_ratio_vs_baseline"] = compare(results, baseline)
+    print(json.dumps(report, indent=2))
+    if output:
+        with open(output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--only", help="run only benchmarks whose name contains this string")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="JSON report of an earlier run to compare ops/s against")
+    parser.add_argument("--log", action="store_true", help="keep INFO logs of the pipeline on")
+    args = parser.parse_args()
+    if not args.log:
+        # Построчные INFO-логи менеджера и обработчиков иначе заглушают вывод
+        logging.disable(logging.INFO)
+    asyncio.run(main(args.iterations, args.only, args.output, args.compare))
@@ -0,0 +1,98 @@
+"""Latency of task detail lookups by task_oid as the tasks table grows.
+
+Seeds synthetic rows into the live database up to each requested size and times
+SQLAlchemyTasksRepository.get for random existing oids. Run inside the application
+container (``make app-shell``)::
+
+    python -m benchmarks.task_detail_lookup --sizes 100000,1000000,10000000 --lookups 2000 --cleanup
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from sqlalchemy import func, select, text
+
+from app.common.stats import LatencyWindow
+from app.domain.sql.models import Task as TaskModel
+from app.infrastructure.uow.base import BaseUnitOfWork
+from app.services.init import init_container
+
+SEED_DESCRIPTION = "benchmark lookup"
+SEED_STEP = 1_000_000
+
+
+async def table_size(uow: BaseUnitOfWork) -> int:
+    async with uow.transaction() as scoped:
+        return await scoped.session.scalar(select(func.count()).select_from(TaskModel))
+
+
+async def seed(uow: BaseUnitOfWork, rows: int) -> None:
+    while rows > 0:
+        step = min(rows, SEED_STEP)
+        async with uow.transaction() as scoped:
+            await scoped.session.execute(
+                text(
+                    "INSERT INTO tasks (task_oid, description, status, create_time) "
+                    "SELECT gen_random_uuid(), :description, 'Completed', now() FROM generate_series(1, :rows)"
+                ),
+                {"description": SEED_DESCRIPTION, "rows": step},
+            )
+        rows -= step
+
+
+async def sample_oids(uow: BaseUnitOfWork, count: int) -> List[str]:
+    async with uow.transaction() as scoped:
+        result = await scoped.session.execute(
+            text("SELECT task_oid::text FROM tasks TABLESAMPLE SYSTEM (1) LIMIT :count"),
+            {"count": count},
+        )
+        return [row[0] for row in result]
+
+
+async def measure(uow: BaseUnitOfWork, oids: List[str]) -> LatencyWindow:
+    window = LatencyWindow(size=len(oids))
+    for oid in oids:
+        started = time.perf_counter()
+        async with uow.transaction() as scoped:
+            await scoped.repository(TaskModel).get(oid)
+        window.observe(time.perf_counter() - started)
+    return window
+
+
+async def main(sizes: List[int], lookups: int, cleanup: bool) -> None:
+    uow: BaseUnitOfWork = init_container().resolve(BaseUnitOfWork)
+    try:
+        for size in sizes:
+            current = await table_size(uow)
+            if current < size:
+                await seed(uow, size - current)
+            async with uow.transaction() as scoped:
+                await scoped.session.execute(text("ANALYZE tasks"))
+
+            window = await measure(uow, await sample_oids(uow, lookups))
+            snapshot = window.snapshot()
+            print(json.dumps({
+                "rows": max(current, size),
+                "lookups": snapshot["count"],
+                "p50_ms": round(snapshot["p50"] * 1000, 4),
+                "p99_ms": round(snapshot["p99"] * 1000, 4),
+                "max_ms": round(snapshot["max"] * 1000, 4),
+            }))
+    finally:
+        if cleanup:
+            async with uow.transaction() as scoped:
+                await scoped.session.execute(
+                    text("DELETE FROM tasks WHERE description = :description"),
+                    {"description": SEED_DESCRIPTION},
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000,10000000")
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main([int(size) for size in args.sizes.split(",")], args.lookups, args.cleanup))
@@ -19,3 +19,8 @@ def task_repository(container: Container) -> BaseTasksRepository:
 @fixture()
 def mediator(container: Container) -> Mediator:
     return container.resolve(Mediator)
+
+
+@fixture()
+def anyio_backend() -> str:
+    return "asyncio"
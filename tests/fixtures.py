@@ -1,11 +1,13 @@
 from punq import Container, Scope
 
+from app.common.enums import BrokerBackend
 from app.infrastructure.repositories.base import BaseTasksRepository
 from app.infrastructure.repositories.memory import MemoryTasksRepository
 from app.services.init import _init_container
+from app.settings.conf import Config
 
 
 def init_test_container() -> Container:
-    container = _init_container()
+    container = _init_container(Config(BROKER_BACKEND=BrokerBackend.memory))
     container.register(BaseTasksRepository, MemoryTasksRepository, scope=Scope.singleton)
     return container
@@ -0,0 +1,83 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.api.dependencies import get_admission, get_mediator
+from app.application.api.entrypoint import create_app
+from app.domain.sql.models import OutboxMessage
+from app.infrastructure.message_brokers.memory import InMemoryMessageBroker
+from app.services.admission import AdmissionController
+from app.services.exceptions.admission import TaskAdmissionRejectedException
+from benchmarks.fakes import FakeUnitOfWork
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_controller(pending: int = 0, **options) -> AdmissionController:
+    uow = FakeUnitOfWork()
+    await uow.outbox.add_many(
+        OutboxMessage(id=number, routing_key="task.created", payload={}) for number in range(pending)
+    )
+    return AdmissionController(InMemoryMessageBroker(), uow=uow, **options)
+
+
+async def test_backlog_counts_outbox_and_unacked_allowance():
+    controller = await create_controller(pending=30, unacked_allowance=10)
+
+    assert await controller.backlog() == 40
+
+
+async def test_rejects_above_priority_limit_only():
+    controller = await create_controller(pending=30, high_water_mark=1000, priority_limits={0: 20})
+
+    with pytest.raises(TaskAdmissionRejectedException):
+        async with controller.admit(0, "client"):
+            pass
+    async with controller.admit(5, "client"):
+        pass
+
+
+async def test_retry_after_scales_with_exceeded_limit():
+    controller = await create_controller(pending=80, high_water_mark=1000, priority_limits={0: 20}, retry_after=2)
+
+    with pytest.raises(TaskAdmissionRejectedException) as rejected:
+        async with controller.admit(0, "client"):
+            pass
+
+    assert rejected.value.retry_after == 8
+
+
+async def test_client_limit():
+    controller = await create_controller(client_max_in_flight=1)
+
+    async with controller.admit(0, "client"):
+        with pytest.raises(TaskAdmissionRejectedException):
+            async with controller.admit(0, "client"):
+                pass
+        async with controller.admit(0, "other"):
+            pass
+
+    assert controller.statistics()["clients_in_flight"] == 0
+
+
+async def test_rejected_clients_are_not_tracked():
+    controller = await create_controller(pending=10, high_water_mark=5)
+
+    for number in range(1000):
+        with pytest.raises(TaskAdmissionRejectedException):
+            async with controller.admit(0, f"client {number}"):
+                pass
+
+    assert controller.statistics()["clients_in_flight"] == 0
+    assert controller.statistics()["rejected"] == {"backlog": 1000}
+
+
+async def test_overloaded_create_returns_429_with_retry_after():
+    controller = await create_controller(pending=30, high_water_mark=10, retry_after=1)
+    app = create_app()
+    app.dependency_overrides[get_admission] = lambda: controller
+    app.dependency_overrides[get_mediator] = lambda: None
+
+    response = TestClient(app).post("/tasks/", json={"description": "task"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+import pytest
+
+from app.infrastructure.exceptions.filters import InvalidCursorException
+from app.infrastructure.filters.tasks import TasksCursor
+
+
+@pytest.mark.parametrize("create_time", [datetime(2024, 5, 1, 12, 30), datetime(2024, 5, 1, 12, 30, 0, 123456)])
+def test_cursor_round_trip(create_time: datetime):
+    cursor = TasksCursor(create_time=create_time, id=42)
+
+    assert TasksCursor.decode(cursor.encode()) == cursor
+
+
+def test_cursor_is_url_safe():
+    encoded = TasksCursor(create_time=datetime(2024, 5, 1), id=2 ** 40).encode()
+
+    assert not set(encoded) & {"+", "/"}
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    "bm90IGpzb24=",  # "not json"
+    "WzFd",  # [1]
+    "WyJub3QgYSBkYXRlIiwgMV0=",  # ["not a date", 1]
+    "WyIyMDI0LTA1LTAxVDAwOjAwOjAwIiwgImlkIl0=",  # ["2024-05-01T00:00:00", "id"]
+    "eyJhIjogMX0=",  # {"a": 1}
+])
+def test_cursor_rejects_bad_input(cursor: str):
+    with pytest.raises(InvalidCursorException):
+        TasksCursor.decode(cursor)
@@ -0,0 +1,22 @@
+import punq
+import pytest
+
+from app.common.enums import BrokerBackend
+from app.infrastructure.cache.base import BaseTaskCache
+from app.services.admission import AdmissionController
+from app.services.events.manager import ThreadTaskQueueManager
+from app.services.events.outbox import OutboxRelay
+from app.services.init import _init_worker_container
+from app.services.mediator.base import Mediator
+from app.settings.conf import Config
+
+
+def test_worker_container_holds_only_what_the_worker_runs():
+    container = _init_worker_container(Config(BROKER_BACKEND=BrokerBackend.memory))
+
+    manager = container.resolve(ThreadTaskQueueManager)
+    assert manager.cache is None
+    assert manager.status_sink is not None and manager.status_sink.cache is None
+    for dependency in (Mediator, OutboxRelay, AdmissionController, BaseTaskCache):
+        with pytest.raises(punq.MissingDependencyError):
+            container.resolve(dependency)
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.common.enums import ExecutorBackend, SchedulerMode, Status
+from app.domain.entities.tasks import Task
+from app.infrastructure.message_brokers.memory import InMemoryMessageBroker
+from app.services.events.manager import ThreadTaskQueueManager
+from app.services.events.status_sink import TaskStatusSink
+from benchmarks.fakes import FakeUnitOfWork
+
+pytestmark = pytest.mark.anyio
+
+
+class SlowManager(ThreadTaskQueueManager):
+    async def _execute(self, task: Task) -> Task:
+        task.start_time = datetime.now()
+        await asyncio.sleep(0.2)
+        task.exec_time = datetime.now() - task.start_time
+        task.status = Status.completed.value
+        return task
+
+
+def create_manager(uow: FakeUnitOfWork, **options) -> SlowManager:
+    options = {
+        "scheduler": SchedulerMode.asyncio,
+        "executor_backend": ExecutorBackend.inline,
+        "workers": 1,
+        "status_sink": TaskStatusSink(uow),
+        "stop_timeout": 0.3,
+        **options,
+    }
+    return SlowManager(uow, InMemoryMessageBroker(), **options)
+
+
+async def add_due_tasks(uow: FakeUnitOfWork, count: int) -> None:
+    await uow.tasks.add_many(
+        Task.create_task(Status.in_queue.value, f"task {number}", interval=timedelta(hours=1), run_at=datetime.now())
+        for number in range(count)
+    )
+
+
+async def test_stop_returns_claimed_tasks_that_never_ran():
+    uow = FakeUnitOfWork()
+    await add_due_tasks(uow, 10)
+    manager = create_manager(uow)
+
+    await manager.start()
+    await asyncio.sleep(0.1)
+    await manager.stop()
+
+    rows = list(uow.tasks._rows.values())
+    assert not [row for row in rows if row.status == Status.in_queue.value]
+    assert all(row.claimed_at is None for row in rows)
+    # Выполненные задачи перенесены на следующий час, прерванные остались к запуску сейчас
+    ran = [row for row in rows if row.last_status == Status.completed.value]
+    assert ran and len(ran) < len(rows)
+    assert all(row.run_at > datetime.now() for row in ran)
+
+
+async def test_scheduler_claims_only_free_queue_slots():
+    uow = FakeUnitOfWork()
+    await add_due_tasks(uow, 10)
+    manager = create_manager(uow, queue_size=3)
+
+    await manager.start()
+    await asyncio.sleep(0.1)
+    claimed = sum(row.status == Status.in_queue.value for row in uow.tasks._rows.values())
+    await manager.stop()
+
+    # Одна задача выполняется, три ждут в очереди
+    assert claimed <= 4
+
+
+class FailingManager(ThreadTaskQueueManager):
+    async def _execute(self, task: Task) -> Task:
+        raise RuntimeError("boom")
+
+
+async def test_failed_task_from_broker_is_recorded_before_ack():
+    uow = FakeUnitOfWork()
+    broker = InMemoryMessageBroker()
+    manager = FailingManager(
+        uow, broker, scheduler=SchedulerMode.asyncio, executor_backend=ExecutorBackend.inline,
+        status_sink=TaskStatusSink(uow, flush_interval=0.01),
+    )
+    task = Task.create_task(Status.in_queue.value, "task")
+    await uow.tasks.add_many([task])
+    await broker.send_message("task.created", task.to_payload())
+
+    await manager.start()
+    await asyncio.sleep(0.1)
+    await manager.stop()
+
+    assert (await uow.tasks.get(task.oid)).status == Status.failed.value
+    assert broker.statistics()["acked"] == 1
+    assert broker.statistics()["nacked"] == 0
@@ -0,0 +1,125 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.application.api.dependencies import get_mediator
+from app.application.api.entrypoint import create_app
+from app.common.enums import DispatchPolicy
+from app.services.commands.base import BaseCommand, CommandHandler
+from app.services.exceptions.mediator import MediatorTimeoutException
+from app.services.mediator.background import BackgroundDispatcher
+from app.services.mediator.base import Mediator
+from app.services.mediator.middlewares import ConcurrencyLimitMiddleware, TimeoutMiddleware
+from app.services.queries.base import BaseQuery, QueryHandler
+from app.services.queries.tasks import GetTasksQuery
+from app.settings.conf import Config
+
+pytestmark = pytest.mark.anyio
+
+
+@dataclass(frozen=True, eq=False)
+class SleepQuery(BaseQuery):
+    seconds: float
+
+
+@dataclass(frozen=True)
+class SleepQueryHandler(QueryHandler[SleepQuery, float]):
+    running: List[int] = field(default_factory=lambda: [0, 0])
+
+    async def handle(self, query: SleepQuery) -> float:
+        # running[0] - обработчиков сейчас, running[1] - максимум одновременно
+        self.running[0] += 1
+        self.running[1] = max(self.running)
+        try:
+            await asyncio.sleep(query.seconds)
+        finally:
+            self.running[0] -= 1
+        return query.seconds
+
+
+@dataclass(frozen=True, eq=False)
+class PingCommand(BaseCommand):
+    ...
+
+
+@dataclass(frozen=True)
+class PingCommandHandler(CommandHandler[PingCommand, str]):
+    async def handle(self, command: PingCommand) -> str:
+        return "pong"
+
+
+async def test_timeout_middleware_cancels_slow_dispatch():
+    mediator = Mediator(middlewares=[TimeoutMiddleware(timeouts={"SleepQuery": 0.05})])
+    mediator.register_query(SleepQuery, SleepQueryHandler())
+
+    assert await mediator.handle_query(SleepQuery(0.01)) == 0.01
+    with pytest.raises(MediatorTimeoutException) as error:
+        await mediator.handle_query(SleepQuery(1))
+    assert error.value.timeout == 0.05
+
+
+async def test_timeout_middleware_without_timeout_passes_through():
+    mediator = Mediator(middlewares=[TimeoutMiddleware(timeouts={"OtherQuery": 0.01})])
+    mediator.register_query(SleepQuery, SleepQueryHandler())
+
+    assert await mediator.handle_query(SleepQuery(0.05)) == 0.05
+
+
+async def test_concurrency_limit_middleware_caps_in_flight_dispatches():
+    handler = SleepQueryHandler()
+    mediator = Mediator(middlewares=[ConcurrencyLimitMiddleware(limits={"SleepQuery": 2})])
+    mediator.register_query(SleepQuery, handler)
+
+    await asyncio.gather(*(mediator.handle_query(SleepQuery(0.02)) for _ in range(6)))
+
+    assert handler.running == [0, 2]
+
+
+async def test_concurrency_limit_is_shared_by_mediators_with_one_middleware():
+    handler = SleepQueryHandler()
+    middleware = ConcurrencyLimitMiddleware(limits={"SleepQuery": 1})
+    mediators = [Mediator(middlewares=[middleware]) for _ in range(2)]
+    for mediator in mediators:
+        mediator.register_query(SleepQuery, handler)
+
+    await asyncio.gather(*(mediator.handle_query(SleepQuery(0.02)) for mediator in mediators))
+
+    assert handler.running == [0, 1]
+
+
+def test_background_command_policy_is_rejected_before_registration():
+    mediator = Mediator(background=BackgroundDispatcher())
+
+    with pytest.raises(ValueError):
+        mediator.register_command(PingCommand, [PingCommandHandler(mediator)], policy=DispatchPolicy.background)
+
+    assert PingCommand not in mediator.commands_map
+    assert PingCommand not in mediator._policy_map
+
+
+def test_config_rejects_background_command_policy():
+    with pytest.raises(ValidationError):
+        Config(MEDIATOR_POLICIES={"CreateTaskCommand": "background"})
+
+    assert Config(MEDIATOR_POLICIES={"NewTaskCreatedEvent": "background"}).mediator_policies
+
+
+def test_mediator_timeout_is_answered_with_503():
+    class SlowTasksHandler(QueryHandler[GetTasksQuery, dict]):
+        async def handle(self, query: GetTasksQuery) -> dict:
+            await asyncio.sleep(1)
+            return {"items": [], "next_cursor": None}
+
+    mediator = Mediator(middlewares=[TimeoutMiddleware(timeouts={"GetTasksQuery": 0.05})])
+    mediator.register_query(GetTasksQuery, SlowTasksHandler())
+    app = create_app()
+    app.dependency_overrides[get_mediator] = lambda: mediator
+
+    response = TestClient(app).get("/tasks/")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
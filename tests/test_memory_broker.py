@@ -0,0 +1,195 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from app.infrastructure.message_brokers.base import ConsumedMessage
+from app.infrastructure.message_brokers.memory import InMemoryMessageBroker, topic_matches
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("binding_key, routing_key, matches", [
+    ("#", "task.created", True),
+    ("#", "", True),
+    ("task.*", "task.created", True),
+    ("task.*", "task", False),
+    ("task.*", "task.created.now", False),
+    ("task.#", "task", True),
+    ("task.#", "task.created.now", True),
+    ("*.created", "task.created", True),
+    ("*.created", "task.updated", False),
+    ("#.created", "a.b.created", True),
+    ("task.created", "task.created", True),
+    ("task.created", "task.updated", False),
+])
+def test_topic_matches(binding_key: str, routing_key: str, matches: bool):
+    assert topic_matches(binding_key, routing_key) is matches
+
+
+async def consume(broker: InMemoryMessageBroker, received: List[ConsumedMessage]) -> None:
+    async for message in broker.start_consuming():
+        received.append(message)
+
+
+async def settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_unbound_routing_keys_are_dropped():
+    broker = InMemoryMessageBroker(binding_keys=("task.*",))
+    await broker.send_message("task.created", {"n": 1})
+    await broker.send_message("user.created", {"n": 2})
+
+    assert broker.statistics()["depth"] == 1
+    assert broker.statistics()["unroutable"] == 1
+
+
+async def test_higher_priority_is_delivered_first():
+    broker = InMemoryMessageBroker()
+    for n, priority in enumerate([0, 5, 1, 5]):
+        await broker.send_message("task.created", {"n": n}, priority=priority)
+
+    received: List[ConsumedMessage] = []
+    consumer = asyncio.create_task(consume(broker, received))
+    await settle()
+
+    assert [message.data["n"] for message in received] == [1, 3, 2, 0]
+    await broker.stop_consuming()
+    await consumer
+
+
+async def test_prefetch_limits_unacked_messages():
+    broker = InMemoryMessageBroker(prefetch_count=2)
+    for n in range(5):
+        await broker.send_message("task.created", {"n": n})
+
+    received: List[ConsumedMessage] = []
+    consumer = asyncio.create_task(consume(broker, received))
+    await settle()
+    assert len(received) == 2
+
+    await received[0].ack()
+    await settle()
+    assert [message.data["n"] for message in received] == [0, 1, 2]
+    assert broker.statistics()["unacked"] == 2
+
+    await broker.stop_consuming()
+    await consumer
+
+
+async def test_nack_requeues_or_drops():
+    broker = InMemoryMessageBroker(prefetch_count=1)
+    await broker.send_message("task.created", {"n": 1})
+
+    received: List[ConsumedMessage] = []
+    consumer = asyncio.create_task(consume(broker, received))
+    await settle()
+    await received[0].nack(requeue=True)
+    await settle()
+
+    assert len(received) == 2
+    assert received[1].data == {"n": 1}
+    assert broker.statistics()["redelivered"] == 1
+
+    await received[1].nack(requeue=False)
+    await settle()
+    assert len(received) == 2
+    assert broker.statistics()["depth"] == 0
+    assert broker.statistics()["unacked"] == 0
+
+    await broker.stop_consuming()
+    await consumer
+
+
+async def test_ack_and_nack_are_idempotent():
+    broker = InMemoryMessageBroker(prefetch_count=1)
+    await broker.send_message("task.created", {"n": 1})
+
+    received: List[ConsumedMessage] = []
+    consumer = asyncio.create_task(consume(broker, received))
+    await settle()
+    await received[0].ack()
+    await received[0].ack()
+    await received[0].nack(requeue=True)
+
+    assert broker.statistics()["acked"] == 1
+    assert broker.statistics()["nacked"] == 0
+    assert broker.statistics()["depth"] == 0
+
+    await broker.stop_consuming()
+    await consumer
+
+
+async def test_close_requeues_unacked_messages():
+    broker = InMemoryMessageBroker()
+    for n in range(3):
+        await broker.send_message("task.created", {"n": n})
+
+    received: List[ConsumedMessage] = []
+    consumer = asyncio.create_task(consume(broker, received))
+    await settle()
+    await received[0].ack()
+    await broker.stop_consuming()
+    await consumer
+    await broker.close()
+
+    assert broker.statistics()["depth"] == 2
+    assert broker.statistics()["unacked"] == 0
+
+    await broker.start()
+    redelivered: List[ConsumedMessage] = []
+    consumer = asyncio.create_task(consume(broker, redelivered))
+    await settle()
+    assert sorted(message.data["n"] for message in redelivered) == [1, 2]
+
+    await broker.stop_consuming()
+    await consumer
+
+
+async def test_publish_blocks_at_capacity():
+    broker = InMemoryMessageBroker(queue_size=2, prefetch_count=1)
+    await broker.send_message("task.created", {"n": 1})
+    await broker.send_message("task.created", {"n": 2})
+
+    publisher = asyncio.create_task(broker.send_message("task.created", {"n": 3}))
+    await settle()
+    assert not publisher.done()
+
+    # Полученное, но не подтверждённое сообщение всё ещё занимает место
+    received: List[ConsumedMessage] = []
+    consumer = asyncio.create_task(consume(broker, received))
+    await settle()
+    assert len(received) == 1
+    assert not publisher.done()
+
+    await received[0].ack()
+    await asyncio.wait_for(publisher, 1)
+    assert broker.statistics()["published"] == 3
+
+    await broker.stop_consuming()
+    await consumer
+
+
+async def test_stop_consuming_ends_waiting_consumers():
+    broker = InMemoryMessageBroker(prefetch_count=1)
+    await broker.send_message("task.created", {"n": 1})
+    await broker.send_message("task.created", {"n": 2})
+
+    # Один потребитель ждёт кредит, другой - сообщение в пустой очереди
+    waiting_for_credit: List[ConsumedMessage] = []
+    first = asyncio.create_task(consume(broker, waiting_for_credit))
+    await settle()
+    waiting_for_message: List[ConsumedMessage] = []
+    second = asyncio.create_task(consume(broker, waiting_for_message))
+    await settle()
+    third = asyncio.create_task(consume(broker, []))
+    await settle()
+
+    await broker.stop_consuming()
+    await asyncio.wait_for(asyncio.gather(first, second, third), 1)
+
+    assert len(waiting_for_credit) == 1
+    assert len(waiting_for_message) == 1
+    assert broker.statistics()["unacked"] == 2
@@ -0,0 +1,172 @@
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import pytest
+
+from app.common.enums import Status
+from app.domain.entities.tasks import Task
+from app.domain.sql.models import Task as TaskModel
+from app.infrastructure.filters.tasks import ExportTasksFilters, GetTasksFilters, TasksCursor
+from app.infrastructure.repositories.base import BaseTasksRepository
+
+pytestmark = pytest.mark.anyio
+
+STATUSES = [Status.in_queue.value, Status.run.value, Status.completed.value, Status.failed.value]
+
+
+def make_row(create_time: datetime, status: str, run_at: Optional[datetime] = None) -> TaskModel:
+    return TaskModel(
+        task_oid=str(uuid.uuid4()),
+        description="test",
+        status=status,
+        priority=0,
+        create_time=create_time,
+        run_at=run_at,
+    )
+
+
+def keyset_reference(rows: List[TaskModel], status: str, cursor: Optional[str], limit: int) -> List[TaskModel]:
+    """What the SQL repository selects: status filter, (create_time, id) < cursor, newest first."""
+    matching = [row for row in rows if row.status == status]
+    if cursor:
+        position = TasksCursor.decode(cursor)
+        matching = [row for row in matching if (row.create_time, row.id) < (position.create_time, position.id)]
+    matching.sort(key=lambda row: (row.create_time, row.id), reverse=True)
+    return matching[:limit]
+
+
+async def fill(repository: BaseTasksRepository, count: int) -> List[TaskModel]:
+    generator = random.Random(7)
+    start = datetime(2024, 1, 1)
+    rows = []
+    for _ in range(count):
+        # Повторяющиеся create_time проверяют, что порядок внутри одной секунды задаёт id
+        row = make_row(start + timedelta(seconds=generator.randrange(count // 4)), generator.choice(STATUSES))
+        await repository.add(row)
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize("limit", [1, 7, 50])
+async def test_fetch_all_pages_match_sql_keyset(task_repository: BaseTasksRepository, limit: int):
+    rows = await fill(task_repository, 400)
+
+    for status in STATUSES:
+        cursor = None
+        seen = []
+        while True:
+            page = await task_repository.fetch_all(GetTasksFilters(limit=limit, status=status, cursor=cursor))
+            assert page == keyset_reference(rows, status, cursor, limit)
+            if not page:
+                break
+            seen.extend(page)
+            cursor = TasksCursor(create_time=page[-1].create_time, id=page[-1].id).encode()
+        assert len(seen) == sum(row.status == status for row in rows)
+
+
+async def test_fetch_all_with_cursor_between_rows(task_repository: BaseTasksRepository):
+    rows = await fill(task_repository, 100)
+    cursor = TasksCursor(create_time=datetime(2024, 1, 1, 0, 0, 10), id=10 ** 6).encode()
+
+    page = await task_repository.fetch_all(GetTasksFilters(limit=100, status=Status.completed.value, cursor=cursor))
+
+    assert page == keyset_reference(rows, Status.completed.value, cursor, 100)
+
+
+async def test_update_moves_row_between_status_indexes(task_repository: BaseTasksRepository):
+    row = make_row(datetime(2024, 1, 1), Status.in_queue.value)
+    await task_repository.add(row)
+
+    row.status = Status.completed.value
+    await task_repository.update(row)
+
+    assert await task_repository.fetch_all(GetTasksFilters(status=Status.in_queue.value)) == []
+    assert await task_repository.fetch_all(GetTasksFilters(status=Status.completed.value)) == [row]
+
+
+async def test_bulk_update_moves_rows_between_status_indexes(task_repository: BaseTasksRepository):
+    task = Task.create_task(Status.in_queue.value, "test")
+    await task_repository.add_many([task])
+    task.status = Status.failed.value
+    task.last_status = Status.failed.value
+
+    await task_repository.bulk_update([task])
+
+    row = await task_repository.get(task.oid)
+    assert row.status == Status.failed.value
+    assert row.last_status == Status.failed.value
+    assert await task_repository.fetch_all(GetTasksFilters(status=Status.in_queue.value)) == []
+    assert await task_repository.fetch_all(GetTasksFilters(status=Status.failed.value)) == [row]
+
+
+async def test_remove_drops_row_from_indexes(task_repository: BaseTasksRepository):
+    row = make_row(datetime(2024, 1, 1), Status.completed.value)
+    await task_repository.add(row)
+
+    await task_repository.remove(row.task_oid)
+
+    assert await task_repository.get(row.task_oid) is None
+    assert await task_repository.fetch_all(GetTasksFilters(status=Status.completed.value)) == []
+
+
+async def test_claim_due_takes_due_rows_once(task_repository: BaseTasksRepository):
+    now = datetime(2024, 1, 1, 12)
+    lease_expired_before = now - timedelta(minutes=5)
+    due = [make_row(now, Status.scheduled.value, run_at=now - timedelta(minutes=minutes)) for minutes in (1, 3, 2)]
+    later = make_row(now, Status.scheduled.value, run_at=now + timedelta(minutes=1))
+    for row in [*due, later]:
+        await task_repository.add(row)
+
+    claimed = await task_repository.claim_due(now, 2, lease_expired_before)
+
+    assert claimed == [due[1], due[2]]
+    assert all(row.status == Status.in_queue.value and row.claimed_at == now for row in claimed)
+    assert await task_repository.claim_due(now, 2, lease_expired_before) == [due[0]]
+    assert await task_repository.claim_due(now, 2, lease_expired_before) == []
+    assert await task_repository.fetch_all(GetTasksFilters(status=Status.scheduled.value)) == [later]
+
+
+async def test_claim_due_reclaims_expired_leases(task_repository: BaseTasksRepository):
+    claimed_at = datetime(2024, 1, 1, 12)
+    row = make_row(claimed_at, Status.scheduled.value, run_at=claimed_at)
+    await task_repository.add(row)
+    await task_repository.claim_due(claimed_at, 10, claimed_at)
+
+    # Аренда ещё действует: строку держит воркер, забравший её первым
+    assert await task_repository.claim_due(claimed_at + timedelta(minutes=1), 10, claimed_at) == []
+
+    later = claimed_at + timedelta(minutes=10)
+    assert await task_repository.claim_due(later, 10, later - timedelta(minutes=5)) == [row]
+    assert row.claimed_at == later
+
+
+async def test_release_claimed_returns_rows_to_scheduled(task_repository: BaseTasksRepository):
+    now = datetime(2024, 1, 1, 12)
+    pending, finished = (make_row(now, Status.scheduled.value, run_at=now) for _ in range(2))
+    await task_repository.add(pending)
+    await task_repository.add(finished)
+    await task_repository.claim_due(now, 10, now)
+    task = Task(oid=finished.task_oid, description="test", status=Status.completed.value)
+    await task_repository.bulk_update([task])
+
+    await task_repository.release_claimed([pending.task_oid, finished.task_oid])
+
+    assert pending.status == Status.scheduled.value and pending.claimed_at is None
+    assert finished.status == Status.completed.value and finished.claimed_at is None
+
+
+async def test_stream_all_orders_like_sql(task_repository: BaseTasksRepository):
+    rows = await fill(task_repository, 100)
+
+    exported = [row async for chunk in task_repository.stream_all(ExportTasksFilters(), chunk_size=7) for row in chunk]
+    assert [row["id"] for row in exported] == sorted(row.id for row in rows)
+
+    status = Status.completed.value
+    exported = [
+        row async for chunk in task_repository.stream_all(ExportTasksFilters(status=status), chunk_size=7)
+        for row in chunk
+    ]
+    expected = sorted((row for row in rows if row.status == status), key=lambda row: (row.create_time, row.id))
+    assert [row["id"] for row in exported] == [row.id for row in expected]
@@ -0,0 +1,88 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Optional, Tuple
+
+import pytest
+
+from app.domain.sql.models import OutboxMessage
+from app.infrastructure.message_brokers.memory import InMemoryMessageBroker
+from app.services.events.outbox import OutboxRelay
+from benchmarks.fakes import FakeUnitOfWork
+
+pytestmark = pytest.mark.anyio
+
+
+@dataclass
+class RecordingBroker(InMemoryMessageBroker):
+    """Records every publish together with how many outbox rows were already marked sent at that moment."""
+    uow: Optional[FakeUnitOfWork] = None
+    failures: int = 0
+    published: List[Tuple[str, int, List[Any], int]] = field(default_factory=list)
+
+    async def send_messages(self, routing_key: str, data: Iterable[Any], priority: int = 0) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("broker is unreachable")
+        data = list(data)
+        sent = len(self.uow.outbox.messages) - await self.uow.outbox.count_pending()
+        self.published.append((routing_key, priority, data, sent))
+        await super().send_messages(routing_key, data, priority=priority)
+
+
+async def create_relay(count: int, batch_size: int = 500, failures: int = 0, **options) -> OutboxRelay:
+    uow = FakeUnitOfWork()
+    await uow.outbox.add_many(
+        OutboxMessage(id=number, routing_key="task.created", priority=number % 2, payload={"number": number})
+        for number in range(count)
+    )
+    broker = RecordingBroker(uow=uow, failures=failures)
+    return OutboxRelay(uow, broker, batch_size=batch_size, **options)
+
+
+async def test_relays_pending_rows_in_batches():
+    relay = await create_relay(5, batch_size=2)
+
+    assert [await relay.relay_batch() for _ in range(4)] == [2, 2, 1, 0]
+    assert await relay.uow.outbox.count_pending() == 0
+    assert relay.broker.statistics()["published"] == 5
+
+
+async def test_groups_one_batch_by_routing_key_and_priority():
+    relay = await create_relay(4)
+
+    await relay.relay_batch()
+
+    assert [(priority, [item["number"] for item in data]) for _, priority, data, _ in relay.broker.published] == [
+        (0, [0, 2]),
+        (1, [1, 3]),
+    ]
+
+
+async def test_marks_rows_sent_only_after_publish():
+    relay = await create_relay(3)
+
+    await relay.relay_batch()
+
+    assert [sent for *_, sent in relay.broker.published] == [0, 0]
+    assert await relay.uow.outbox.count_pending() == 0
+
+
+async def test_failed_publish_leaves_rows_pending():
+    relay = await create_relay(3, failures=1)
+
+    with pytest.raises(ConnectionError):
+        await relay.relay_batch()
+
+    assert await relay.uow.outbox.count_pending() == 3
+    assert await relay.relay_batch() == 3
+    assert await relay.uow.outbox.count_pending() == 0
+
+
+async def test_running_relay_retries_after_failure():
+    relay = await create_relay(3, failures=1, poll_interval=0.01)
+
+    await relay.start()
+    await asyncio.sleep(0.1)
+    await relay.stop()
+
+    assert await relay.uow.outbox.count_pending() == 0
@@ -0,0 +1,123 @@
+import asyncio
+from typing import Iterable, List
+
+import pytest
+
+from app.common.enums import Status
+from app.domain.entities.tasks import Task
+from app.domain.sql.models import Task as TaskModel
+from app.infrastructure.repositories.memory import MemoryTasksRepository
+from app.services.events.status_sink import TaskStatusSink
+from benchmarks.fakes import FakeUnitOfWork
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingTasksRepository(MemoryTasksRepository):
+    def __init__(self, failures: int = 0):
+        super().__init__()
+        self.failures = failures
+        self.batches: List[List[str]] = []
+
+    async def bulk_update(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is down")
+        self.batches.append([task.oid for task in tasks])
+        await super().bulk_update(tasks)
+
+
+async def create_uow(count: int, failures: int = 0) -> tuple:
+    uow = FakeUnitOfWork()
+    uow.tasks = RecordingTasksRepository(failures)
+    uow.register_repository(TaskModel, uow.tasks)
+    tasks = [Task.create_task(Status.in_queue.value, f"task {number}") for number in range(count)]
+    await uow.tasks.add_many(tasks)
+    for task in tasks:
+        task.status = Status.completed.value
+    return uow, tasks
+
+
+async def stored_status(uow: FakeUnitOfWork, task: Task) -> str:
+    return (await uow.tasks.get(task.oid)).status
+
+
+def ack_into(acked: List[str], oid: str):
+    async def ack() -> None:
+        acked.append(oid)
+    return ack
+
+
+async def test_flushes_when_batch_is_full():
+    uow, tasks = await create_uow(3)
+    sink = TaskStatusSink(uow, max_batch_size=3, flush_interval=10)
+    await sink.start()
+
+    for task in tasks:
+        await sink.put(task)
+    await asyncio.sleep(0.05)
+
+    assert uow.tasks.batches == [[task.oid for task in tasks]]
+    await sink.stop()
+
+
+async def test_flushes_after_interval():
+    uow, tasks = await create_uow(1)
+    sink = TaskStatusSink(uow, max_batch_size=100, flush_interval=0.1)
+    await sink.start()
+
+    await sink.put(tasks[0])
+    await asyncio.sleep(0.02)
+    assert uow.tasks.batches == []
+    await asyncio.sleep(0.2)
+    assert uow.tasks.batches == [[tasks[0].oid]]
+    await sink.stop()
+
+
+async def test_stop_drains_pending_updates():
+    uow, tasks = await create_uow(5)
+    sink = TaskStatusSink(uow, max_batch_size=2, flush_interval=10)
+    await sink.start()
+
+    for task in tasks:
+        await sink.put(task)
+    await sink.stop()
+
+    assert sorted(oid for batch in uow.tasks.batches for oid in batch) == sorted(task.oid for task in tasks)
+    assert all([await stored_status(uow, task) == Status.completed.value for task in tasks])
+
+
+async def test_retries_batch_after_failed_commit():
+    uow, tasks = await create_uow(2, failures=1)
+    acked = []
+    sink = TaskStatusSink(uow, flush_interval=0.01)
+    await sink.start()
+
+    for task in tasks:
+        await sink.put(task, on_flushed=ack_into(acked, task.oid))
+    await asyncio.sleep(0.1)
+    await sink.stop()
+
+    assert uow.tasks.failures == 0
+    assert len(uow.tasks.batches) == 1
+    assert sorted(acked) == sorted(task.oid for task in tasks)
+
+
+async def test_acks_only_after_commit():
+    uow, tasks = await create_uow(1, failures=1)
+    task = tasks[0]
+    seen_status = []
+
+    async def ack() -> None:
+        seen_status.append(await stored_status(uow, task))
+
+    sink = TaskStatusSink(uow, flush_interval=10)
+    await sink.put(task, on_flushed=ack)
+
+    await sink.flush()
+    assert seen_status == []
+    assert await stored_status(uow, task) == Status.in_queue.value
+
+    await sink.flush()
+    assert seen_status == [Status.completed.value]
@@ -0,0 +1,78 @@
+import pytest
+
+from app.common.enums import BrokerBackend, Status
+from app.infrastructure.cache import memory
+from app.infrastructure.cache.base import BaseTaskCache
+from app.infrastructure.cache.memory import LRUTaskCache
+from app.services.init import _init_container
+from app.settings.conf import Config
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(memory.time, "monotonic", lambda: now[0])
+    return now
+
+
+def task(oid: str, status: str = Status.in_queue.value) -> dict:
+    return {"task_oid": oid, "status": status}
+
+
+def test_non_terminal_task_expires_after_ttl(clock):
+    cache = LRUTaskCache(ttl=2.0)
+    cache.set("a", task("a"))
+
+    clock[0] += 1.9
+    assert cache.get("a") == task("a")
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert cache.statistics()["size"] == 0
+
+
+def test_terminal_task_does_not_expire(clock):
+    cache = LRUTaskCache(ttl=2.0)
+    cache.set("a", task("a", Status.completed.value))
+
+    clock[0] += 3600
+    assert cache.get("a") == task("a", Status.completed.value)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUTaskCache(max_size=2)
+    cache.set("a", task("a"))
+    cache.set("b", task("b"))
+    cache.get("a")
+    cache.set("c", task("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.statistics()["evictions"] == 1
+
+
+def test_invalidate_drops_only_cached_entries():
+    cache = LRUTaskCache()
+    cache.set("a", task("a", Status.completed.value))
+
+    cache.invalidate(["a", "missing"])
+
+    assert cache.get("a") is None
+    assert cache.statistics()["invalidations"] == 1
+
+
+def test_zero_size_disables_cache():
+    cache = LRUTaskCache(max_size=0)
+    cache.set("a", task("a", Status.completed.value))
+
+    assert cache.get("a") is None
+    assert cache.statistics()["size"] == 0
+
+
+@pytest.mark.parametrize("run_worker, enabled", [(True, True), (False, False)])
+def test_cache_disabled_without_in_process_worker(run_worker, enabled):
+    container = _init_container(Config(BROKER_BACKEND=BrokerBackend.memory, API_RUN_WORKER=run_worker))
+    cache = container.resolve(BaseTaskCache)
+    cache.set("a", task("a", Status.completed.value))
+
+    assert (cache.get("a") is not None) is enabled
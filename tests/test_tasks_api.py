@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application.api.dependencies import get_config, get_mediator
+from app.application.api.entrypoint import create_app
+from app.common.metrics import HTTP_REQUEST_DURATION
+from app.settings.conf import Config
+
+
+class PageMediator:
+    def __init__(self, next_cursor=None):
+        self.next_cursor = next_cursor
+        self.queries = []
+
+    async def handle_query(self, query):
+        self.queries.append(query)
+        task = {
+            "task_oid": "oid",
+            "description": "task",
+            "status": "Completed",
+            "priority": 0,
+            "create_time": datetime(2024, 1, 1),
+            "start_time": None,
+            "exec_time": None,
+            "run_at": None,
+            "interval": None,
+            "last_status": None,
+        }
+        return {"items": [task], "next_cursor": self.next_cursor}
+
+
+def create_client(mediator: PageMediator, fast_json: bool = True) -> TestClient:
+    app = create_app()
+    app.dependency_overrides[get_mediator] = lambda: mediator
+    app.dependency_overrides[get_config] = lambda: Config(API_FAST_JSON=fast_json)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("fast_json", [True, False])
+def test_fetch_tasks_returns_list_with_cursor_header(fast_json):
+    response = create_client(PageMediator(next_cursor="next"), fast_json).get("/tasks/")
+
+    assert response.status_code == 200
+    assert [task["task_oid"] for task in response.json()] == ["oid"]
+    assert response.headers["X-Next-Cursor"] == "next"
+
+
+def test_fetch_tasks_last_page_has_no_cursor_header():
+    response = create_client(PageMediator()).get("/tasks/")
+
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.parametrize("limit", [0, 5000])
+def test_fetch_tasks_rejects_limit_out_of_range(limit):
+    mediator = PageMediator()
+
+    response = create_client(mediator).get("/tasks/", params={"limit": limit})
+
+    assert response.status_code == 422
+    assert mediator.queries == []
+
+
+def test_rejected_limit_is_recorded_as_422():
+    labels = ("GET", "/tasks/", "422")
+    before = HTTP_REQUEST_DURATION._series[labels].count if labels in HTTP_REQUEST_DURATION._series else 0
+
+    create_client(PageMediator()).get("/tasks/", params={"limit": 0})
+
+    assert HTTP_REQUEST_DURATION._series[labels].count == before + 1
+    assert ("GET", "/tasks/", "500") not in HTTP_REQUEST_DURATION._series
@@ -0,0 +1,69 @@
+from app.services.events.timers import TimerHeap
+
+
+def test_pop_due_returns_values_earliest_first():
+    timers = TimerHeap()
+    timers.push("c", 3.0, "third")
+    timers.push("a", 1.0, "first")
+    timers.push("b", 2.0, "second")
+    timers.push("d", 10.0, "later")
+
+    assert timers.pop_due(3.0) == ["first", "second", "third"]
+    assert len(timers) == 1
+    assert timers.next_deadline() == 10.0
+
+
+def test_equal_deadlines_keep_push_order():
+    timers = TimerHeap()
+    for number in range(5):
+        timers.push(number, 1.0, number)
+
+    assert timers.pop_due(1.0) == [0, 1, 2, 3, 4]
+
+
+def test_push_replaces_timer_with_same_key():
+    timers = TimerHeap()
+    timers.push("task", 1.0, "old")
+    timers.push("task", 5.0, "new")
+
+    assert len(timers) == 1
+    assert timers.pop_due(1.0) == []
+    assert timers.next_deadline() == 5.0
+    assert timers.pop_due(5.0) == ["new"]
+
+
+def test_cancel():
+    timers = TimerHeap()
+    timers.push("a", 1.0, "a")
+    timers.push("b", 2.0, "b")
+
+    assert timers.cancel("a") is True
+    assert timers.cancel("a") is False
+    assert timers.cancel("missing") is False
+    assert "a" not in timers
+    assert "b" in timers
+    assert timers.next_deadline() == 2.0
+    assert timers.pop_due(2.0) == ["b"]
+    assert timers.next_deadline() is None
+
+
+def test_cancelled_entries_are_compacted():
+    timers = TimerHeap()
+    for number in range(1000):
+        timers.push(number, float(number), number)
+    for number in range(990):
+        timers.cancel(number)
+
+    assert len(timers) == 10
+    assert len(timers._heap) <= 2 * len(timers) + 64
+    assert timers.pop_due(float("inf")) == list(range(990, 1000))
+
+
+def test_repeated_replace_does_not_grow_heap():
+    timers = TimerHeap()
+    for deadline in range(1000):
+        timers.push("task", float(deadline), deadline)
+
+    assert len(timers) == 1
+    assert len(timers._heap) <= 2 * len(timers) + 64
+    assert timers.pop_due(float("inf")) == [999]